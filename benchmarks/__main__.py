@@ -0,0 +1,64 @@
+import argparse
+import json
+import platform
+import sys
+from typing import Dict, Optional
+
+from . import codec, importtime, index, models, throughput
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+HIGHER_IS_BETTER = ("rps",)
+
+def compare(results: Results, baseline: Results) -> None:
+    print(f"\n{'benchmark':<44} {'metric':<14} {'baseline':>12} {'current':>12} {'change':>9}")
+    for suite, benchmarks in results.items():
+        for name, metrics in benchmarks.items():
+            for metric, value in metrics.items():
+                before: Optional[float] = baseline.get(suite, {}).get(name, {}).get(metric, None)
+                if before is None or metric == "errors": continue
+                change = (value - before) / before * 100 if before else 0.0
+                better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+                mark = "+" if better and abs(change) >= 5 else "-" if abs(change) >= 5 else " "
+                print(f"{suite + '/' + name:<44} {metric:<14} {before:>12.2f} {value:>12.2f} {change:>+8.1f}% {mark}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="run the KitsuPy benchmark suite")
+    parser.add_argument("--suite", nargs="+", choices=["throughput", "models", "codec", "index", "importtime"], default=["throughput", "models", "codec", "index", "importtime"])
+    parser.add_argument("--requests", type=int, default=500, help="requests per throughput scenario")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server latency, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--count", type=int, default=50000, help="documents for the model benchmarks")
+    parser.add_argument("--import-budget", type=float, default=50.0, help="maximum milliseconds for a cold 'from kitsupy import Kitsu' or 'KitsuAsync'")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    args = parser.parse_args()
+
+    results: Results = {}
+    if "throughput" in args.suite:
+        print("# throughput (mock server)")
+        results["throughput"] = throughput.main(args.requests, args.workers, args.latency, args.jitter, args.error_rate)
+    if "models" in args.suite:
+        print("\n# models")
+        results["models"] = models.main(args.count)
+    if "codec" in args.suite:
+        print("\n# codec")
+        results["codec"] = codec.main()
+    if "index" in args.suite:
+        print("\n# search index (built from an export)")
+        results["index"] = index.main()
+    if "importtime" in args.suite:
+        print("\n# import time")
+        results["importtime"] = importtime.main(budget=args.import_budget)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(results, json.load(file)["results"])
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"python": sys.version.split()[0], "platform": platform.platform(), "results": results}, file, indent=2)
+
+if __name__ == "__main__":
+    main()
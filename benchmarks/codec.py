@@ -0,0 +1,34 @@
+import json
+import time
+from typing import Any, Callable, Dict
+
+from kitsupy import codec
+from kitsupy.models import GeneralResult
+
+from .fixtures import resource
+
+def timed(function: Callable[[], Any], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(count: int = 2000) -> Dict[str, Dict[str, float]]:
+    body = json.dumps({"data": [resource(id) for id in range(1, count + 1)]}).encode("utf-8")
+    results = [GeneralResult(document) for document in json.loads(body)["data"]]
+    timings = {}
+    print(f"{'codec':<10} {'decode':>12} {'to_json x N':>14} {'dumps_many':>12}")
+    for name in codec.available():
+        current = codec.set_codec(name)
+        decode = timed(lambda: current.loads(body))
+        each = timed(lambda: [result.to_json() for result in results])
+        bulk = timed(lambda: codec.dumps_many(results))
+        timings[name] = {"decode_ms": decode * 1e3, "to_json_ms": each * 1e3, "dumps_many_ms": bulk * 1e3}
+        print(f"{name:<10} {decode * 1e3:>9.2f} ms {each * 1e3:>11.2f} ms {bulk * 1e3:>9.2f} ms")
+    codec.set_codec()
+    return timings
+
+if __name__ == "__main__":
+    main()
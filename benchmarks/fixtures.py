@@ -0,0 +1,286 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+from kitsupy import SQLiteStore
+from kitsupy.models.base import GENRE_NAMES
+
+MEDIA_URL = "https://media.kitsu.io"
+SIZES = ("tiny", "small", "medium", "large", "original")
+SUBTYPES = {"anime": ("TV", "movie", "OVA", "ONA", "special"), "manga": ("manga", "novel", "manhwa", "oneshot")}
+ROLES = ("sequel", "prequel", "side_story", "adaptation", "spinoff")
+EPOCH = datetime(2024, 5, 1, 6, 0, 0)
+SEASONS = ("winter", "winter", "spring", "spring", "spring", "summer", "summer", "summer", "fall", "fall", "fall", "winter")
+
+def timestamp(seconds: int) -> str:
+    return (EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+def images(kind: str, id: int, media: Optional[str] = "anime", media_url: Optional[str] = MEDIA_URL) -> Dict[str, Any]:
+    images: Dict[str, Any] = {size: f"{media_url}/{media}/{kind}/{id}/{size}.jpg" for size in SIZES}
+    images["meta"] = {"dimensions": {size: {"width": 110, "height": 156} for size in SIZES[:-1]}}
+    return images
+
+def resource(id: int, media: Optional[str] = "anime", media_url: Optional[str] = MEDIA_URL) -> Dict[str, Any]:
+    attributes = {
+        "createdAt": "2013-02-20T17:13:58.457Z",
+        "updatedAt": timestamp(id),
+        "slug": f"{media}-{id}",
+        "synopsis": "Lorem ipsum dolor sit amet. " * 20,
+        "description": "Lorem ipsum dolor sit amet. " * 20,
+        "coverImageTopOffset": 100,
+        "titles": {"en": f"Title {id}", "en_jp": f"Taitoru {id}", "ja_jp": "タイトル"},
+        "canonicalTitle": f"Title {id}",
+        "abbreviatedTitles": [f"T{id}"],
+        "averageRating": f"{60 + id % 40}.{id % 100:02d}",
+        "ratingFrequencies": {str(n): str(n * 100) for n in range(2, 21)},
+        "userCount": 150000 - id,
+        "favoritesCount": 3000,
+        "startDate": f"{1980 + id % 45}-{id // 45 % 12 + 1:02d}-04",
+        "endDate": f"{1980 + id % 45}-{id // 45 % 12 + 1:02d}-28",
+        "nextRelease": None,
+        "popularityRank": id,
+        "ratingRank": id * 2,
+        "ageRating": "R",
+        "ageRatingGuide": "Violence",
+        "subtype": SUBTYPES[media][id % len(SUBTYPES[media])],
+        "status": "finished",
+        "tba": None,
+        "posterImage": images("poster_images", id, media, media_url),
+        "coverImage": images("cover_images", id, media, media_url)
+    }
+    if media == "anime":
+        attributes.update(episodeCount=12, episodeLength=24, youtubeVideoId="abc")
+    else:
+        attributes.update(chapterCount=120, volumeCount=12, serialization="Weekly Shōnen Jump")
+
+    return {
+        "id": str(id),
+        "type": media,
+        "links": {"self": f"https://kitsu.io/api/edge/{media}/{id}"},
+        "attributes": attributes,
+        "relationships": {"genres": {"data": [{"type": "genres", "id": "1"}, {"type": "genres", "id": "24"}]}}
+    }
+
+def sparse(resource: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if fields is None: return resource
+    return {
+        "id": resource["id"],
+        "type": resource["type"],
+        "attributes": {name: value for name, value in resource["attributes"].items() if name in fields}
+    }
+
+class Catalog:
+    def __init__(
+        self,
+        anime: Optional[int] = 20000,
+        manga: Optional[int] = 60000,
+        characters: Optional[int] = 12,
+        store: Optional[SQLiteStore] = None,
+        media_url: Optional[str] = MEDIA_URL
+    ):
+        self.counts = {"anime": anime, "manga": manga}
+        self.created = dict(self.counts)
+        self.characters = characters
+        self.store = store
+        self.media_url = media_url
+        self.touched: Dict[Tuple[str, int], str] = {}
+        self.filtered: Dict[Tuple[str, int, Tuple[Tuple[str, str], ...]], List[int]] = {}
+        self.clock = 10 ** 8
+
+    def touch(self, media: str, id: Optional[int] = None) -> int:
+        if id is None: id = self.counts[media] = self.counts[media] + 1
+        self.clock += 1
+        self.touched[(media, id)] = timestamp(self.clock)
+        return id
+
+    def __resource__(self, id: int, media: str) -> Dict[str, Any]:
+        data = resource(id, media, self.media_url)
+        updated_at = self.touched.get((media, id), None)
+        if updated_at is not None:
+            data["attributes"]["updatedAt"] = updated_at
+            if id > self.created[media]: data["attributes"]["createdAt"] = updated_at
+        return data
+
+    def __recorded__(self, type: str, id: int) -> Optional[Dict[str, Any]]:
+        if self.store is None: return None
+        return self.store.get(type, id)
+
+    def exists(self, media: str, id: int) -> bool:
+        return 1 <= id <= self.counts[media] or self.__recorded__(media, id) is not None
+
+    def document(self, media: str, id: int) -> Dict[str, Any]:
+        recorded = self.__recorded__(media, id)
+        if recorded is not None: return recorded
+
+        data = self.__resource__(id, media)
+        included: List[Dict[str, Any]] = [
+            {"id": "1", "type": "genres", "attributes": {"name": GENRE_NAMES[1]}},
+            {"id": "24", "type": "genres", "attributes": {"name": GENRE_NAMES[24]}}
+        ]
+        characters = []
+        for n in range(self.characters):
+            character = {"type": "mediaCharacters", "id": str(id * 1000 + n)}
+            characters.append(character)
+            included.append({**character, "attributes": {"role": "main" if n < 2 else "supporting"}})
+        data["relationships"]["characters"] = {"data": characters}
+
+        if media == "anime":
+            productions = []
+            for n, role in enumerate(("producer", "licensor", "studio")):
+                producer = {"type": "producers", "id": str(id % 500 + n)}
+                production = {"type": "animeProductions", "id": str(id * 10 + n)}
+                productions.append(production)
+                included.append({**producer, "attributes": {"name": f"Producer {producer['id']}"}})
+                included.append({
+                    **production,
+                    "attributes": {"role": role},
+                    "relationships": {"producer": {"data": producer}}
+                })
+            data["relationships"]["animeProductions"] = {"data": productions}
+        return {"data": data, "included": included}
+
+    def character(self, media: str, id: int) -> Dict[str, Any]:
+        recorded = self.__recorded__(f"{media}Characters", id)
+        if recorded is not None: return recorded
+
+        data = {
+            "id": str(id),
+            "type": "characters",
+            "attributes": {
+                "slug": f"character-{id}",
+                "names": {"en": f"Character {id}"},
+                "canonicalName": f"Character {id}",
+                "otherNames": [],
+                "name": f"Character {id}",
+                "malId": id,
+                "description": "Lorem ipsum dolor sit amet. " * 10,
+                "image": {"original": f"https://media.kitsu.io/characters/images/{id}/original.jpg"}
+            }
+        }
+        if media != "anime": return {"data": data}
+
+        included = []
+        voices = []
+        for n, locale in enumerate(("ja_jp", "en")):
+            person = {"type": "people", "id": str(id * 10 + n)}
+            voice = {"type": "characterVoices", "id": str(id * 10 + n)}
+            voices.append(voice)
+            included.append({
+                **voice,
+                "attributes": {"locale": locale},
+                "relationships": {"person": {"data": person}}
+            })
+            included.append({
+                **person,
+                "attributes": {"name": f"Person {person['id']}", "description": "", "image": None}
+            })
+        included.insert(0, {
+            "type": "mediaCharacters",
+            "id": str(id),
+            "attributes": {"role": "main"},
+            "relationships": {"voices": {"data": voices}}
+        })
+        return {"data": data, "included": included}
+
+    def media_characters(self, media: str, ids: List[int]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        data, included = [], []
+        for id in ids:
+            if id % 1000 >= self.characters or not 1 <= id // 1000 <= self.counts[media]: continue
+            character = self.character(media, id)
+            data.append({
+                "id": str(id),
+                "type": "mediaCharacters",
+                "attributes": {"role": "main" if id % 1000 < 2 else "supporting"},
+                "relationships": {
+                    "character": {"data": {"type": "characters", "id": character["data"]["id"]}},
+                    **({"voices": character["included"][0]["relationships"]["voices"]} if media == "anime" else {})
+                }
+            })
+            included.append(character["data"])
+            included.extend(character.get("included", [])[1:])
+        return data, included
+
+    def cast(self, media: str, id: int, offset: int, limit: int) -> Dict[str, Any]:
+        ids = [id * 1000 + n for n in range(offset, min(offset + limit, self.characters))]
+        data, included = self.media_characters(media, ids)
+        return {"data": data, "included": included, "meta": {"count": self.characters}, "links": {}}
+
+    def characters_of(self, media: str, ids: List[int]) -> Dict[str, Any]:
+        data, included = self.media_characters(media, ids)
+        return {"data": data, "included": included, "meta": {"count": len(data)}, "links": {}}
+
+    def relationships(self, media: str, id: int, fields: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        recorded = self.__recorded__(f"{media}Relationships", id)
+        if recorded is not None: return recorded
+
+        data, included = [], {}
+        for n, role in enumerate(ROLES[:id % len(ROLES) + 1]):
+            type = ("manga" if media == "anime" else "anime") if role == "adaptation" else media
+            destination = id + n + 1 if id + n + 1 <= self.counts[type] else max(1, id - n - 1)
+            data.append({
+                "id": str(id * 10 + n),
+                "type": "mediaRelationships",
+                "attributes": {"role": role},
+                "relationships": {"destination": {"data": {"type": type, "id": str(destination)}}}
+            })
+            included.setdefault((type, destination), sparse(self.__resource__(destination, type), fields.get(type, None) if fields else None))
+        return {"data": data, "included": list(included.values())}
+
+    def matches(self, media: str, id: int, filters: Dict[str, str]) -> bool:
+        year, month = 1980 + id % 45, id // 45 % 12 + 1
+        for name, value in filters.items():
+            if name == "year":
+                start, _, end = value.partition("..")
+                if year < int(start) or (end and year > int(end)): return False
+            elif name == "subtype":
+                if SUBTYPES[media][id % len(SUBTYPES[media])].lower() not in value.lower().split(","): return False
+            elif name == "season":
+                if media != "anime" or SEASONS[month - 1] not in value.split(","): return False
+        return True
+
+    def __filtered__(self, media: str, filters: Dict[str, str]) -> List[int]:
+        key = (media, self.counts[media], tuple(sorted(filters.items())))
+        ids = self.filtered.get(key, None)
+        if ids is None:
+            ids = self.filtered[key] = [id for id in range(1, self.counts[media] + 1) if self.matches(media, id, filters)]
+        return ids
+
+    def page(
+        self, media: str, offset: int, limit: int, sort: Optional[str] = None,
+        fields: Optional[List[str]] = None, filters: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        count = self.counts[media]
+        ids = range(offset + 1, min(offset + limit, count) + 1)
+        if filters:
+            matched = self.__filtered__(media, filters)
+            count = len(matched)
+            ids = (matched[::-1] if sort is not None and sort.startswith("-") else matched)[offset:offset + limit]
+        elif sort == "-updatedAt":
+            touched = sorted(
+                ((updated_at, id) for (type, id), updated_at in self.touched.items() if type == media), reverse=True
+            )
+            order = [id for _, id in touched]
+            skip = set(order)
+            untouched = (id for id in range(count, 0, -1) if id not in skip)
+            ids = order[offset:offset + limit]
+            ids += islice(untouched, max(offset - len(order), 0), max(offset - len(order), 0) + limit - len(ids))
+        elif sort is not None and sort.startswith("-"):
+            ids = range(count - offset, max(count - offset - limit, 0), -1)
+        return {
+            "data": [sparse(self.__resource__(id, media), fields) for id in ids],
+            "meta": {"count": count},
+            "links": {}
+        }
+
+    def batch(self, media: str, ids: List[int], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        data, included, seen = [], [], set()
+        for id in ids:
+            if not self.exists(media, id): continue
+            document = self.document(media, id)
+            data.append(sparse(document["data"], fields))
+            for resource in document.get("included", None) or []:
+                key = (resource["type"], resource["id"])
+                if key in seen: continue
+                seen.add(key)
+                included.append(resource)
+        return {"data": data, "included": included, "meta": {"count": len(data)}}
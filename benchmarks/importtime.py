@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY: Tuple[str, ...] = ("aiohttp", "requests", "httpx", "numpy", "msgspec")
+TRACKED: Tuple[str, ...] = HEAVY + ("asyncio", "multiprocessing")
+SYNC: Tuple[str, ...] = ("asyncio", "multiprocessing")
+
+SCENARIOS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "import asyncio": ("import asyncio", ()),
+    "import kitsupy": ("import kitsupy", TRACKED),
+    "from kitsupy import Kitsu": ("from kitsupy import Kitsu", TRACKED),
+    "from kitsupy import KitsuAsync": ("from kitsupy import KitsuAsync", HEAVY + ("multiprocessing",)),
+    "Kitsu()": ("from kitsupy import Kitsu; Kitsu()", ("aiohttp", "httpx", "numpy") + SYNC),
+    "KitsuAsync()": ("from kitsupy import KitsuAsync; KitsuAsync()", ("requests", "httpx", "numpy", "multiprocessing"))
+}
+
+# scenario -> reference scenario whose time is not charged to kitsupy
+BUDGETS: Dict[str, Optional[str]] = {
+    "from kitsupy import Kitsu": None,
+    "from kitsupy import KitsuAsync": "import asyncio"
+}
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "modules": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+def probe(statement: str) -> Dict[str, object]:
+    code = PROBE.format(statement=statement, heavy=TRACKED)
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, stdout=subprocess.PIPE).stdout
+    return json.loads(output)
+
+def measure(repeat: int) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    results, failures = {}, []
+    print(f"{'scenario':<34} {'cold import':>12}  tracked modules")
+    for name, (statement, forbidden) in SCENARIOS.items():
+        runs = [probe(statement) for _ in range(repeat)]
+        best = min(run["ms"] for run in runs)
+        modules = sorted(set(module for run in runs for module in run["modules"]))
+        results[name] = {"import_ms": best}
+        print(f"{name:<34} {best:>9.2f} ms  {', '.join(modules) or '-'}")
+        failures.extend(f"{name} imported {module}" for module in modules if module in forbidden)
+    return results, failures
+
+def main(repeat: int = 5, budget: float = 50.0) -> Dict[str, Dict[str, float]]:
+    results, failures = measure(repeat)
+    for name, reference in BUDGETS.items():
+        cold = results[name]["import_ms"] - (results[reference]["import_ms"] if reference else 0.0)
+        label = f"{name} took {cold:.2f} ms" + (f" on top of {reference}" if reference else "")
+        if cold > budget: failures.append(f"{label} (budget {budget:.2f} ms)")
+    for failure in failures: print(f"FAIL {failure}")
+    if failures: raise SystemExit(1)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime", description="check the cold import time of kitsupy")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per scenario, the best run is kept")
+    parser.add_argument("--budget", type=float, default=50.0, help="maximum milliseconds for a cold 'from kitsupy import Kitsu' or 'KitsuAsync'")
+    args = parser.parse_args()
+    main(args.repeat, args.budget)
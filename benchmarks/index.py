@@ -0,0 +1,48 @@
+import asyncio
+import tempfile
+import time
+from typing import Dict, List
+
+from kitsupy import KitsuAsync, SearchIndex
+from kitsupy.enums import Media
+from kitsupy.export import Exporter
+
+from .fixtures import Catalog
+from .server import serve
+
+QUERIES: List[str] = ["Title 12", "title 123", "Taitoru 4", "Titel 77", "T12", "T1234"]
+
+def main(count: int = 5000, repeat: int = 200) -> Dict[str, Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as directory:
+        with serve(catalog=Catalog(anime=count, manga=0)) as server:
+            async def export() -> None:
+                async with KitsuAsync() as client:
+                    client.url = server.url
+                    await Exporter(client, directory).export(Media.ANIME)
+            asyncio.run(export())
+
+        start = time.perf_counter()
+        index = SearchIndex.from_export(directory)
+        index.search(Media.ANIME, "warm up")
+        build = time.perf_counter() - start
+
+    timings = {"build": {"ms": build * 1e3, "titles": len(index)}}
+    print(f"{'query':<12} {'matches':>8} {'p50':>10}")
+    for query in QUERIES:
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = index.search(Media.ANIME, query)
+            latencies.append(time.perf_counter() - start)
+        p50 = sorted(latencies)[len(latencies) // 2]
+        timings[query] = {"p50_ms": p50 * 1e3, "matches": result.total_result}
+        print(f"{query:<12} {result.total_result:>8} {p50 * 1e3:>7.3f} ms")
+
+    abbreviated = index.search(Media.ANIME, "T12")
+    if not any(result.id == 12 for result in abbreviated.results):
+        print("FAIL an index built from an export does not match abbreviated titles ('T12')")
+        raise SystemExit(1)
+    return timings
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from kitsupy.jsonapi import Resolver
+from kitsupy.models import AnimeModel, GeneralResult
+from kitsupy.models.base import GENRE_NAMES, convert_to, get_dates, get_images
+
+from .fixtures import Catalog, resource
+
+class EagerGeneral:
+    def __init__(self, response: Dict[str, Any]):
+        attributes = response.get("attributes", {})
+        self.id = int(response.get("id", None))
+        self.type = response.get("type", None)
+        self.titles = attributes.get("titles", None)
+        self.canonical_title = attributes.get("canonicalTitle", None)
+        self.average_rating = float(attributes.get("averageRating", None))
+        self.popularity_rank = attributes.get("popularityRank", None)
+        self.rating_rank = attributes.get("ratingRank", None)
+        self.subtype = attributes.get("subtype", None)
+        self.status = attributes.get("status", None)
+        self.poster_images = get_images(attributes, "posterImage")
+        self.cover_images = get_images(attributes, "coverImage")
+
+class EagerAnime:
+    def __init__(self, response: Dict[str, Any]):
+        data = response.get("data", {})
+        resolver = Resolver(response.get("included", []))
+        attributes = data.get("attributes", {})
+        relationships = data.get("relationships", {})
+
+        self.id = convert_to(data.get("id", None), int)
+        self.type = data.get("type", None)
+        self.created_at = get_dates(attributes, "createdAt")
+        self.updated_at = get_dates(attributes, "updatedAt")
+        self.slug = attributes.get("slug", None)
+        self.synopsis = attributes.get("synopsis", None)
+        self.description = attributes.get("description", None)
+        self.cover_image_top_off_set = attributes.get("coverImageTopOffset", None)
+        self.titles = attributes.get("titles", None)
+        self.canonical_title = attributes.get("canonicalTitle", None)
+        self.abbreviated_titles = attributes.get("abbreviatedTitles", None)
+        self.average_rating = convert_to(attributes.get("averageRating", None), float)
+        self.rating_frequencies = attributes.get("ratingFrequencies", None)
+        self.user_count = attributes.get("userCount", None)
+        self.favorites_count = attributes.get("favoritesCount", None)
+        self.start_date = get_dates(attributes, "startDate")
+        self.end_date = get_dates(attributes, "endDate")
+        self.next_release = attributes.get("nextRelease", None)
+        self.popularity_rank = attributes.get("popularityRank", None)
+        self.rating_rank = attributes.get("ratingRank", None)
+        self.age_rating = attributes.get("ageRating", None)
+        self.age_rating_guide = attributes.get("ageRatingGuide", None)
+        self.subtype = attributes.get("subtype", None)
+        self.status = attributes.get("status", None)
+        self.tba = attributes.get("tba", None)
+        self.poster_images = get_images(attributes, "posterImage")
+        self.cover_images = get_images(attributes, "coverImage")
+        ids = {int(genre["id"]) for genre in relationships["genres"]["data"]}
+        self.genres = [name for id, name in GENRE_NAMES.items() if id in ids]
+
+        characters: Dict[str, List[int]] = {"main": [], "supporting": []}
+        for character in resolver.of_type("mediaCharacters"):
+            role = character["attributes"]["role"]
+            if role in characters: characters[role].append(int(character["id"]))
+        self.main_characters = characters["main"]
+        self.supporting_characters = characters["supporting"]
+
+        self.episode_count = attributes.get("episodeCount", None)
+        self.episode_length = attributes.get("episodeLength", None)
+        self.youtube_video_id = attributes.get("youtubeVideoId", None)
+        roles: Dict[Tuple[str, str], Set[str]] = {}
+        for production in resolver.of_type("animeProductions"):
+            for producer in resolver.related(production, "producer"):
+                roles.setdefault((producer["type"], producer["id"]), set()).add(production["attributes"]["role"])
+        productions: Dict[str, List[str]] = {"producer": [], "licensor": [], "studio": []}
+        for producer in resolver.of_type("producers"):
+            for role in roles.get((producer["type"], producer["id"]), ()):
+                if role in productions: productions[role].append(producer["attributes"]["name"])
+        self.producers = productions["producer"]
+        self.licensors = productions["licensor"]
+        self.studies = productions["studio"]
+
+def measure(
+    name: str, build: Callable[[Dict[str, Any]], Any], payload: str,
+    touch: Callable[[Any], Any] = None
+) -> Dict[str, float]:
+    def run(documents: List[Dict[str, Any]]) -> List[Any]:
+        objects = [build(document) for document in documents]
+        if touch is not None:
+            for obj in objects: touch(obj)
+        return objects
+
+    elapsed = min(timed(run, json.loads(payload)) for _ in range(3))
+    gc.collect()
+    tracemalloc.start()
+    documents = json.loads(payload)
+    count = len(documents)
+    objects = run(documents)
+    del documents
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    result = {"us_per_obj": elapsed / count * 1e6, "bytes_per_obj": memory / count}
+    print(f"{name:<32} {result['us_per_obj']:>10.2f} us/obj {result['bytes_per_obj']:>10.0f} B/obj")
+    return result
+
+def timed(function: Callable[[List[Dict[str, Any]]], Any], documents: List[Dict[str, Any]]) -> float:
+    start = time.perf_counter()
+    function(documents)
+    return time.perf_counter() - start
+
+def main(count: int = 50000) -> Dict[str, Dict[str, float]]:
+    print(f"{'':<32} {'build':>17} {'retained':>15}")
+
+    results = {}
+    payload = json.dumps([resource(id) for id in range(1, count + 1)])
+    results["EagerGeneral"] = measure("EagerGeneral (__dict__)", EagerGeneral, payload)
+    results["GeneralResult"] = measure("GeneralResult (__slots__)", GeneralResult, payload)
+
+    payload = json.dumps([{"data": resource(id), "included": []} for id in range(1, count // 10 + 1)])
+    results["EagerAnime"] = measure("EagerAnime (__dict__)", EagerAnime, payload)
+    results["AnimeModel"] = measure("AnimeModel", AnimeModel, payload)
+    results["AnimeModel.canonical_title"] = measure("AnimeModel + canonical_title", AnimeModel, payload, lambda model: model.canonical_title)
+    results["AnimeModel.to_dict"] = measure("AnimeModel + to_dict()", AnimeModel, payload, lambda model: model.to_dict())
+
+    catalog = Catalog()
+    payload = json.dumps([catalog.document("anime", id) for id in range(1, count // 10 + 1)])
+    results["EagerAnime.included"] = measure("EagerAnime (with included)", EagerAnime, payload)
+    results["AnimeModel.included"] = measure("AnimeModel (with included)", AnimeModel, payload)
+    return results
+
+if __name__ == "__main__":
+    main()
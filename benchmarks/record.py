@@ -0,0 +1,24 @@
+import argparse
+
+from kitsupy import Kitsu, SQLiteStore
+from kitsupy.enums import Media
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.record",
+        description="record kitsu.io documents into a SQLite store usable as benchmarks.server --fixtures"
+    )
+    parser.add_argument("path", help="SQLite store file")
+    parser.add_argument("--media", choices=[media.value for media in Media], default=Media.ANIME.value)
+    parser.add_argument("ids", nargs="+", type=int)
+    args = parser.parse_args()
+
+    media = Media(args.media)
+    client = Kitsu(store=SQLiteStore(args.path, max_age=None))
+    for id in args.ids:
+        client.anime(id) if media == Media.ANIME else client.manga(id)
+        client.franchises(media, id)
+        print(f"{media.value} {id}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from aiohttp import web
+
+from kitsupy import SQLiteStore
+
+from .fixtures import MEDIA_URL, Catalog
+
+CONTENT_TYPE = "application/vnd.api+json"
+
+def fields_of(request: web.Request, type: str) -> Optional[List[str]]:
+    fields = request.query.get(f"fields[{type}]", None)
+    return fields.split(",") if fields is not None else None
+
+def not_found(detail: str) -> web.Response:
+    body = {"errors": [{"title": "Record not found", "detail": detail, "code": "404", "status": "404"}]}
+    return web.Response(status=404, body=json.dumps(body), content_type=CONTENT_TYPE)
+
+class MockServer:
+    def __init__(
+        self,
+        catalog: Optional[Catalog] = None,
+        host: Optional[str] = "127.0.0.1",
+        port: Optional[int] = 0,
+        latency: Optional[float] = 0.0,
+        jitter: Optional[float] = 0.0,
+        error_rate: Optional[float] = 0.0,
+        error_status: Optional[int] = 503,
+        retry_after: Optional[float] = None,
+        seed: Optional[int] = None,
+        local_media: Optional[bool] = False
+    ):
+        self.catalog = catalog if catalog is not None else Catalog()
+        self.local_media = local_media
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def application(self) -> web.Application:
+        app = web.Application(middlewares=[self.__inject__])
+        app.router.add_get("/media-characters/{id}/character", self.character)
+        app.router.add_get("/media-characters", self.cast)
+        app.router.add_get("/media-relationships", self.relationships)
+        app.router.add_get("/{media:anime|manga}", self.collection)
+        app.router.add_get("/{media:anime|manga}/{id}", self.detail)
+        app.router.add_get("/media/{path:.+}", self.media)
+        return app
+
+    @web.middleware
+    async def __inject__(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else "unknown"
+        self.requests[route] += 1
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0: await asyncio.sleep(delay)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors[route] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+            return web.Response(status=self.error_status, text="<html>Service Unavailable</html>", headers=headers)
+        return await handler(request)
+
+    def respond(self, document: Dict[str, Any]) -> web.Response:
+        return web.Response(body=json.dumps(document), content_type=CONTENT_TYPE)
+
+    async def detail(self, request: web.Request) -> web.Response:
+        media, id = request.match_info["media"], int(request.match_info["id"])
+        if not self.catalog.exists(media, id): return not_found(f"{media} {id}")
+        return self.respond(self.catalog.document(media, id))
+
+    async def collection(self, request: web.Request) -> web.Response:
+        media = request.match_info["media"]
+        fields = fields_of(request, media)
+        ids = request.query.get("filter[id]", None)
+        if ids is not None:
+            return self.respond(self.catalog.batch(media, [int(id) for id in ids.split(",")], fields))
+
+        limit = int(request.query.get("page[limit]", 10))
+        offset = int(request.query.get("page[offset]", 0))
+        filters = {name: request.query[f"filter[{name}]"] for name in ("year", "subtype", "season") if f"filter[{name}]" in request.query}
+        return self.respond(self.catalog.page(media, offset, limit, request.query.get("sort", None), fields, filters))
+
+    async def character(self, request: web.Request) -> web.Response:
+        media = "anime" if "include" in request.query else "manga"
+        return self.respond(self.catalog.character(media, int(request.match_info["id"])))
+
+    async def cast(self, request: web.Request) -> web.Response:
+        media = request.query.get("filter[media_type]", "Anime").lower()
+        ids = request.query.get("filter[id]", None)
+        if ids is not None:
+            media = "anime" if "voices.person" in request.query.get("include", "") else "manga"
+            return self.respond(self.catalog.characters_of(media, [int(id) for id in ids.split(",")]))
+
+        id = int(request.query["filter[media_id]"])
+        limit = int(request.query.get("page[limit]", 10))
+        offset = int(request.query.get("page[offset]", 0))
+        return self.respond(self.catalog.cast(media, id, offset, limit))
+
+    async def relationships(self, request: web.Request) -> web.Response:
+        media = request.query.get("filter[source_type]", "Anime").lower()
+        id = int(request.query["filter[source_id]"])
+        fields = {type: fields_of(request, type) for type in ("anime", "manga")}
+        return self.respond(self.catalog.relationships(media, id, fields))
+
+    async def media(self, request: web.Request) -> web.Response:
+        body = hashlib.sha256(request.match_info["path"].encode("utf-8")).digest() * 64
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match", None) == etag: return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="image/jpeg", headers={"ETag": etag})
+
+    async def start(self) -> "MockServer":
+        self.runner = web.AppRunner(self.application(), access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.port = self.runner.addresses[0][1]
+        if self.local_media: self.catalog.media_url = f"{self.url}/media"
+        return self
+
+    async def stop(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.errors.clear()
+
+@contextmanager
+def serve(**options: Any) -> Iterator[MockServer]:
+    server = MockServer(**options)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, name="kitsu-mock", daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        yield server
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.server", description="local stand-in for the Kitsu API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--fixtures", help="SQLite store with recorded documents (see benchmarks.record)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--local-media", action="store_true", help="serve the poster/cover images from this server")
+    args = parser.parse_args()
+
+    store = SQLiteStore(args.fixtures, max_age=None) if args.fixtures else None
+    media_url = f"http://{args.host}:{args.port}/media" if args.local_media else MEDIA_URL
+    server = MockServer(
+        Catalog(store=store, media_url=media_url), args.host, args.port, args.latency, args.jitter,
+        args.error_rate, args.error_status, args.retry_after, args.seed
+    )
+    web.run_app(server.application(), host=args.host, port=args.port, access_log=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List
+
+from kitsupy import Kitsu, KitsuAsync
+from kitsupy.enums import Media
+
+from .server import serve
+
+def percentile(values: List[float], q: float) -> float:
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def summarize(name: str, latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    result = {
+        "rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "errors": errors
+    }
+    print(f"{name:<28} {result['rps']:>9.1f} req/s {result['p50_ms']:>8.2f} ms p50 {result['p99_ms']:>8.2f} ms p99 {errors:>5} errors")
+    return result
+
+def run_sync(url: str, call: Callable[[Kitsu, int], Any], count: int, workers: int) -> Dict[str, Any]:
+    client = Kitsu()
+    client.url = url
+    latencies: List[float] = []
+    errors = 0
+
+    def timed(n: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            call(client, n)
+        except Exception:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(timed, range(1, count + 1)))
+    return {"latencies": latencies, "errors": errors, "elapsed": time.perf_counter() - start}
+
+def run_async(url: str, call: Callable[[KitsuAsync, int], Awaitable[Any]], count: int, concurrency: int) -> Dict[str, Any]:
+    async def main() -> Dict[str, Any]:
+        latencies: List[float] = []
+        errors = 0
+        async with KitsuAsync(max_concurrency=concurrency) as client:
+            client.url = url
+
+            numbers = iter(range(1, count + 1))
+
+            async def worker() -> None:
+                nonlocal errors
+                for n in numbers:
+                    start = time.perf_counter()
+                    try:
+                        await call(client, n)
+                    except Exception:
+                        errors += 1
+                        continue
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return {"latencies": latencies, "errors": errors, "elapsed": time.perf_counter() - start}
+    return asyncio.run(main())
+
+SCENARIOS = {
+    "anime": (
+        lambda client, n: client.anime(n),
+        lambda client, n: client.anime(n)
+    ),
+    "popularity": (
+        lambda client, n: client.popularity(Media.ANIME, page=n, limit=20),
+        lambda client, n: client.popularity(Media.ANIME, page=n, limit=20)
+    ),
+    "franchises": (
+        lambda client, n: client.franchises(Media.ANIME, n),
+        lambda client, n: client.franchises(Media.ANIME, n)
+    )
+}
+
+def main(
+    count: int = 500, workers: int = 16, latency: float = 0.0, jitter: float = 0.0,
+    error_rate: float = 0.0, seed: int = 0
+) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with serve(latency=latency, jitter=jitter, error_rate=error_rate, retry_after=0, seed=seed) as server:
+        for scenario, (sync_call, async_call) in SCENARIOS.items():
+            run = run_sync(server.url, sync_call, count, workers)
+            results[f"Kitsu.{scenario}"] = summarize(f"Kitsu.{scenario}", run["latencies"], run["errors"], run["elapsed"])
+            run = run_async(server.url, async_call, count, workers)
+            results[f"KitsuAsync.{scenario}"] = summarize(f"KitsuAsync.{scenario}", run["latencies"], run["errors"], run["elapsed"])
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.throughput")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16, help="threads for Kitsu, max_concurrency for KitsuAsync")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    main(args.requests, args.workers, args.latency, args.jitter, args.error_rate)
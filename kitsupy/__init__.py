@@ -1,3 +1,44 @@
-from .kitsuasync import KitsuAsync
-from .kitsu import Kitsu
-from .exceptions import KitsuException
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .kitsuasync import KitsuAsync
+    from .kitsu import Kitsu
+    from .exceptions import KitsuException
+    from .cache import ResponseCache
+    from .frame import ResultFrame
+    from .images import ImageCache
+    from .index import SearchIndex
+    from .store import SQLiteStore
+    from .ratelimit import RateLimiter, RetryPolicy, SharedRateLimiter
+    from .stats import SpanAdapter, Stats
+    from .transports import AsyncTransport, Transport
+
+EXPORTS: Dict[str, str] = {
+    "KitsuAsync": ".kitsuasync",
+    "Kitsu": ".kitsu",
+    "KitsuException": ".exceptions",
+    "ResponseCache": ".cache",
+    "ResultFrame": ".frame",
+    "ImageCache": ".images",
+    "SearchIndex": ".index",
+    "SQLiteStore": ".store",
+    "RateLimiter": ".ratelimit",
+    "RetryPolicy": ".ratelimit",
+    "SharedRateLimiter": ".ratelimit",
+    "SpanAdapter": ".stats",
+    "Stats": ".stats",
+    "AsyncTransport": ".transports",
+    "Transport": ".transports"
+}
+
+__all__ = list(EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    if name not in EXPORTS: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(EXPORTS))
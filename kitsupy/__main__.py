@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from .enums import Media
+
+def progress(event) -> None:
+    end = "\n" if event.done else "\r"
+    print(f"{event.media.value:<6} {event.count:>8}/{event.total:<8} {event.rate:>9.1f} records/s", end=end, file=sys.stderr)
+
+async def export(args: argparse.Namespace) -> None:
+    from .export import Exporter
+    from .kitsuasync import KitsuAsync
+
+    async with KitsuAsync(max_concurrency=args.concurrency) as client:
+        if args.url: client.url = args.url
+        exporter = Exporter(
+            client, args.output,
+            format=args.format,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            progress=progress
+        )
+        if args.restart: exporter.reset()
+        await exporter.export(*(Media(media) for media in args.media))
+
+async def sync(args: argparse.Namespace) -> None:
+    from .kitsuasync import KitsuAsync
+    from .store import SQLiteStore
+    from .sync import Synchronizer
+
+    async with KitsuAsync(store=SQLiteStore(args.store, max_age=None)) as client:
+        if args.url: client.url = args.url
+        synchronizer = Synchronizer(client, args.watermarks or f"{args.store}.sync.json", since=args.since)
+        if args.restart: synchronizer.reset()
+        for media, count in (await synchronizer.sync(*(Media(media) for media in args.media))).items():
+            print(f"{media.value:<6} {count:>8} refreshed", file=sys.stderr)
+
+def crawl(args: argparse.Namespace) -> None:
+    from .crawler import Crawler
+    from .ratelimit import SharedRateLimiter
+
+    limiter = SharedRateLimiter(rate=args.rate)
+    with Crawler(args.processes, limiter, args.workers, args.chunk_size, args.url, progress) as crawler:
+        missing = crawler.crawl(Media(args.media), range(args.start, args.end + 1), args.output)
+    print(f"{args.media:<6} {len(missing):>8} missing", file=sys.stderr)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="kitsupy")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    parser_export = commands.add_parser("export", help="export the anime/manga catalog")
+    parser_export.add_argument("output", help="output directory")
+    parser_export.add_argument("--media", nargs="+", choices=[media.value for media in Media], default=[media.value for media in Media])
+    parser_export.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser_export.add_argument("--concurrency", type=int, default=4)
+    parser_export.add_argument("--batch-size", type=int, default=5000, help="rows per parquet file")
+    parser_export.add_argument("--url", help="API base url")
+    parser_export.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    parser_export.set_defaults(handler=export)
+
+    parser_sync = commands.add_parser("sync", help="refresh a SQLite mirror with the records updated since the last run")
+    parser_sync.add_argument("store", help="SQLiteStore path")
+    parser_sync.add_argument("--media", nargs="+", choices=[media.value for media in Media], default=[media.value for media in Media])
+    parser_sync.add_argument("--watermarks", help="watermark file (default: STORE.sync.json)")
+    parser_sync.add_argument("--since", help="updatedAt to start from when there is no watermark, e.g. 2024-05-01T00:00:00.000Z")
+    parser_sync.add_argument("--url", help="API base url")
+    parser_sync.add_argument("--restart", action="store_true", help="ignore the saved watermarks")
+    parser_sync.set_defaults(handler=sync)
+
+    parser_crawl = commands.add_parser("crawl", help="fetch an id range with a pool of worker processes")
+    parser_crawl.add_argument("output", help="output JSON lines file")
+    parser_crawl.add_argument("--media", choices=[media.value for media in Media], default=Media.ANIME.value)
+    parser_crawl.add_argument("--start", type=int, default=1)
+    parser_crawl.add_argument("--end", type=int, required=True)
+    parser_crawl.add_argument("--processes", type=int, help="worker processes (default: one per core)")
+    parser_crawl.add_argument("--workers", type=int, default=8, help="threads per worker process")
+    parser_crawl.add_argument("--chunk-size", type=int, default=200, help="ids per task")
+    parser_crawl.add_argument("--rate", type=float, default=10.0, help="requests per second shared by all processes")
+    parser_crawl.add_argument("--url", help="API base url")
+    parser_crawl.set_defaults(handler=crawl)
+
+    args = parser.parse_args(argv)
+    if asyncio.iscoroutinefunction(args.handler): asyncio.run(args.handler(args))
+    else: args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Optional, Tuple
+
+from .enums import Endpoint
+
+DEFAULT_TTL: Dict[Endpoint, float] = {
+    Endpoint.ANIME: 6 * 60 * 60,
+    Endpoint.MANGA: 6 * 60 * 60,
+    Endpoint.CHARACTER: 6 * 60 * 60,
+    Endpoint.FRANCHISES: 6 * 60 * 60,
+    Endpoint.CAST: 6 * 60 * 60,
+    Endpoint.POPULARITY: 10 * 60,
+    Endpoint.TOP_RATE: 10 * 60,
+    Endpoint.SEARCH: 5 * 60,
+    Endpoint.UPCOMING: 60,
+    Endpoint.LATEST: 60
+}
+
+class CacheStats:
+    def __init__(self, hits: int, misses: int, evictions: int, expirations: int, size: int, maxsize: int):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.expirations = expirations
+        self.size = size
+        self.maxsize = maxsize
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self):
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions}, "
+            f"expirations={self.expirations}, size={self.size}, maxsize={self.maxsize})"
+        )
+
+class ResponseCache:
+    def __init__(self, maxsize: Optional[int] = 1024, ttl: Optional[Dict[Endpoint, float]] = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+
+        self.maxsize = maxsize
+        self.ttl = dict(DEFAULT_TTL)
+        if ttl: self.ttl.update(ttl)
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return self.get(url, count=False) is not None
+
+    def get(self, url: str, count: Optional[bool] = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(url, None)
+            if entry is not None:
+                expires, data = entry
+                if expires > monotonic():
+                    self._entries.move_to_end(url)
+                    if count: self._hits += 1
+                    return data
+
+                del self._entries[url]
+                self._expirations += 1
+
+            if count: self._misses += 1
+            return None
+
+    def set(self, url: str, data: Dict[str, Any], endpoint: Endpoint) -> None:
+        ttl = self.ttl.get(endpoint, 0)
+        if ttl <= 0: return
+
+        with self._lock:
+            self._entries[url] = (monotonic() + ttl, data)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions,
+                self._expirations, len(self._entries), self.maxsize
+            )
@@ -0,0 +1,100 @@
+import json
+from importlib import import_module
+from importlib.util import find_spec
+from typing import Any, Callable, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def default(obj: Any) -> Any:
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None: return to_dict()
+    return str(obj)
+
+def json_dumps(obj: Any, indent: Optional[int] = None) -> str:
+    return json.dumps(obj, indent=indent, ensure_ascii=False, default=default)
+
+def json_encode(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def orjson_dumps(obj: Any, indent: Optional[int] = None) -> str:
+        if indent != 2: return json_dumps(obj, indent)
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode("utf-8")
+
+    def orjson_encode(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS)
+
+class Codec:
+    def __init__(
+        self, name: str,
+        loads: Callable[[Union[bytes, str]], Any],
+        dumps: Callable[[Any, Optional[int]], str],
+        encode: Callable[[Any], bytes]
+    ):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.encode = encode
+
+    def __repr__(self):
+        return f"Codec({self.name!r})"
+
+def available() -> Iterable[str]:
+    names = ["json"]
+    if orjson is not None: names.append("orjson")
+    if find_spec("msgspec") is not None: names.append("msgspec")
+    return names
+
+def create(name: Optional[str] = "auto") -> Codec:
+    if name == "auto":
+        name = "orjson" if orjson is not None else "msgspec" if find_spec("msgspec") is not None else "json"
+
+    if name == "json":
+        return Codec("json", json.loads, json_dumps, json_encode)
+    if name == "orjson":
+        if orjson is None: raise ImportError("The orjson codec requires the 'orjson' package")
+        return Codec("orjson", orjson.loads, orjson_dumps, orjson_encode)
+    if name == "msgspec":
+        if find_spec("msgspec") is None: raise ImportError("The msgspec codec requires the 'msgspec' package")
+        decoder = import_module("msgspec.json").Decoder()
+        encode = orjson_encode if orjson is not None else json_encode
+        dumps = orjson_dumps if orjson is not None else json_dumps
+        return Codec("msgspec", decoder.decode, dumps, encode)
+    raise ValueError(f"Unknown codec: {name}")
+
+_codec = create()
+
+def get_codec() -> Codec:
+    return _codec
+
+def set_codec(name: Optional[str] = "auto") -> Codec:
+    global _codec
+    _codec = create(name)
+    return _codec
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _codec.loads(data)
+
+def dumps(obj: Any, indent: Optional[int] = None) -> str:
+    return _codec.dumps(obj, indent)
+
+def encode(obj: Any) -> bytes:
+    return _codec.encode(obj)
+
+def items(objs: Any) -> Iterable[Any]:
+    results = getattr(objs, "results", None)
+    if results is not None: return results
+    if not isinstance(objs, Iterable) and hasattr(objs, "to_dict"): return (objs,)
+    return objs
+
+def dumps_many(objs: Any, indent: Optional[int] = None) -> str:
+    if indent is None: return _codec.encode(list(items(objs))).decode("utf-8")
+    return _codec.dumps(list(items(objs)), indent)
+
+def encode_lines(objs: Any) -> bytes:
+    return b"".join(_codec.encode(obj) + b"\n" for obj in items(objs))
@@ -0,0 +1,296 @@
+from enum import Enum
+from time import perf_counter
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from .cache import ResponseCache
+from .exceptions import KitsuException
+from .index import SearchIndex
+from .jsonapi import MAX_PAGE_LIMIT, decode_response, query_fields, split_document
+from .ratelimit import RateLimiter, RetryPolicy, parse_retry_after
+from .stats import Stats
+from .store import SQLiteStore
+from .transports import Response
+from .models import *
+from .models.base import General, Model
+from .models.character import cast_of
+from .models.franchises import franchises_of
+from .enums import *
+
+T = TypeVar("T")
+
+SORTS: Dict[Endpoint, str] = {
+    Endpoint.POPULARITY: "-user_count",
+    Endpoint.TOP_RATE: "-averageRating",
+    Endpoint.UPCOMING: "-startDate",
+    Endpoint.LATEST: "-created_at"
+}
+
+class Call(Generic[T]):
+    __slots__ = ("url", "endpoint", "parse", "store")
+
+    def __init__(
+        self, url: str, endpoint: Endpoint, parse: Callable[[Dict[str, Any]], T],
+        store: Optional[Tuple[str, Union[int, str]]] = None
+    ):
+        self.url = url
+        self.endpoint = endpoint
+        self.parse = parse
+        self.store = store
+
+class KitsuCore:
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        store: Optional[SQLiteStore] = None,
+        limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        metrics: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        index: Optional[SearchIndex] = None
+    ):
+        self.url = "https://kitsu.io/api/edge"
+        self.cache = cache
+        self.store = store
+        self.limiter = limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.metrics = metrics
+        self.index = index
+        self.stats = Stats()
+        self.headers = {
+            "Accept": "application/vnd.api+json",
+            "Content-Type": "application/vnd.api+json"
+        }
+
+    def __report__(self, event: str, **info: Any) -> None:
+        self.stats(event, info)
+        if self.metrics is not None: self.metrics(event, info)
+
+    def __build__(self, endpoint: Endpoint, build: Callable[[], T]) -> T:
+        start = perf_counter()
+        model = build()
+        self.__report__("build", endpoint=endpoint, elapsed=perf_counter() - start)
+        return model
+
+    def __cached__(self, url: str, endpoint: Endpoint) -> Optional[Dict[str, Any]]:
+        if self.cache is None: return None
+        data = self.cache.get(url)
+        if data is not None: self.__report__("hit", url=url, endpoint=endpoint, source="cache")
+        return data
+
+    def __stored__(self, call: Call) -> Optional[Dict[str, Any]]:
+        if self.store is None or call.store is None: return None
+        data = self.store.get(*call.store)
+        if data is not None: self.__report__("hit", url=call.url, endpoint=call.endpoint, source="store")
+        return data
+
+    def __store__(self, call: Call, data: Dict[str, Any]) -> None:
+        if self.store is not None and call.store is not None: self.store.put(*call.store, data)
+
+    def __failed__(
+        self, url: str, endpoint: Endpoint, attempt: int, error: BaseException,
+        started_at: float, elapsed: float
+    ) -> Optional[float]:
+        if attempt >= self.retry.retries:
+            self.__report__("error", url=url, endpoint=endpoint, attempt=attempt, error=error, started_at=started_at, elapsed=elapsed)
+            return None
+        delay = self.retry.delay(attempt)
+        self.__report__("retry", url=url, endpoint=endpoint, attempt=attempt + 1, status=None, error=error, delay=delay)
+        return delay
+
+    def __response__(
+        self, url: str, endpoint: Endpoint, attempt: int, response: Response,
+        started_at: float, elapsed: float
+    ) -> Tuple[Optional[float], Optional[Dict[str, Any]]]:
+        info = dict(
+            url=url, endpoint=endpoint, attempt=attempt, status=response.status, bytes=len(response.body),
+            ttfb=response.ttfb, started_at=started_at, elapsed=elapsed
+        )
+        if response.status in self.retry.statuses and attempt < self.retry.retries:
+            self.__report__("response", decode=0.0, **info)
+            retry_after = parse_retry_after(response.headers.get("Retry-After", None))
+            delay = self.retry.delay(attempt, retry_after)
+            if self.limiter is not None: self.limiter.backoff(delay if retry_after is not None else None)
+            self.__report__("retry", url=url, endpoint=endpoint, attempt=attempt + 1, status=response.status, error=None, delay=delay)
+            return delay, None
+
+        if self.limiter is not None and response.status < 400: self.limiter.success()
+        start = perf_counter()
+        try:
+            return None, decode_response(response.status, response.reason, response.body)
+        except KitsuException as ex:
+            self.__report__(
+                "error", url=url, endpoint=endpoint, attempt=attempt, status=response.status, error=ex,
+                started_at=started_at, elapsed=elapsed
+            )
+            raise
+        finally:
+            self.__report__("response", decode=perf_counter() - start, **info)
+
+    def __pending__(self, type: str, ids: List[int], endpoint: Endpoint) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        documents, pending = {}, []
+        for id in dict.fromkeys(str(id) for id in ids):
+            data = self.store.get(type, id) if self.store is not None else None
+            if data is not None:
+                documents[id] = data
+                self.__report__("hit", url=None, endpoint=endpoint, source="store")
+            else: pending.append(id)
+        return documents, pending
+
+    def __many_urls__(self, path: str, pending: List[str], include: str) -> List[str]:
+        return [
+            f"{self.url}/{path}?filter[id]={','.join(pending[i:i + MAX_PAGE_LIMIT])}&include={include}&page[limit]={MAX_PAGE_LIMIT}"
+            for i in range(0, len(pending), MAX_PAGE_LIMIT)
+        ]
+
+    def __collect__(
+        self, type: str, documents: Dict[str, Dict[str, Any]], data: Dict[str, Any],
+        split: Callable[[Dict[str, Any]], Dict[str, Dict[str, Any]]] = split_document
+    ) -> None:
+        for id, document in split(data).items():
+            documents[id] = document
+            if self.store is not None: self.store.put(type, id, document)
+
+    def __batch__(self, model: Callable[[Dict[str, Any]], T], ids: List[int], documents: Dict[str, Dict[str, Any]]) -> BatchContainer:
+        return self.__bind__(BatchContainer(
+            [model(documents[str(id)]) for id in ids if str(id) in documents],
+            [id for id in ids if str(id) not in documents]
+        ))
+
+    def __bind__(self, value: T) -> T:
+        if isinstance(value, (Model, Franchise)): value._loader = self.loader
+        elif isinstance(value, tuple):
+            for item in value: self.__bind__(item)
+        elif isinstance(value, BatchContainer):
+            for item in value.results: self.__bind__(item)
+        return value
+
+    def __get_filters__(self, media: Media, filters: Dict[Filter, List[Union[Enum, int]]]) -> str:
+        to_string = lambda iterable, sep: sep.join(iterable)
+        is_type = lambda iterable, t: all(isinstance(value, t) for value in iterable)
+        in_range = lambda iterable, _min, _max: all(n >= _min and n <= _max for n in iterable)
+
+        temp = {}
+        for key, values in filters.items():
+            if key == Filter.AGE_RATING and media == Media.ANIME:
+                aux = [value.value for value in values if value in AgeRating]
+                temp[key.value] = to_string(aux, ",")
+
+            if key == Filter.AVERAGE_RATING and is_type(values, int) and in_range(values, 5, 100):
+                if len(values) == 1: temp[key.value] = f"{values[0]}.."
+                elif len(values) > 1: temp[key.value] = to_string([f"{values[0]}", f"{values[-1]}"], "..")
+
+            if key == Filter.GENRES:
+                aux = [value.name.lower().replace("_", "-") for value in values if value in Genres]
+                temp[key.value] = to_string(aux, ",")
+
+            if key == Filter.SEASON and media == Media.ANIME:
+                aux = [value.value for value in values if value in Season]
+                temp[key.value] = to_string(aux, ",")
+
+            if key == Filter.SUBTYPE:
+                if media == Media.ANIME:
+                    aux = [value.value for value in values if value in AnimeSubtype]
+                if media == Media.MANGA:
+                    aux = [value.value for value in values if value in MangaSubtype]
+                temp[key.value] = to_string(aux, ",")
+
+            if key == Filter.YEAR and is_type(values, int) and in_range(values, 1868, 2030):
+                if len(values) == 1: temp[key.value] = f"{values[0]}.."
+                elif len(values) > 1: temp[key.value] = to_string([f"{values[0]}", f"{values[-1]}"], "..")
+
+        _filter = ""
+        for key in sorted(temp.keys()):
+            if temp[key]: _filter += f"filter[{key}]={temp[key]}&"
+        return _filter
+
+    def __get_fields__(self, media: Media, fields: Optional[List[str]], extra: Optional[List[str]] = None) -> str:
+        if fields is None: fields = list(General.FIELDS.keys())
+        unknown = [field for field in fields if field not in General.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return f"fields[{media.value}]={','.join([General.FIELDS[field] for field in fields] + (extra or []))}&"
+
+    def __list_url__(
+        self, media: Media, sort: str, page: int,
+        filters: Dict[Filter, List[Union[Enum, int]]],
+        limit: int, fields: Optional[List[str]],
+        extra: Optional[List[str]] = None
+    ) -> str:
+        offset = limit * (page - 1)
+        _filters = self.__get_filters__(media, filters)
+        _fields = self.__get_fields__(media, fields, extra)
+        return f"{self.url}/{media.value}?{_filters}{_fields}page[limit]={limit}&page[offset]={offset}&sort={sort}"
+
+    def __anime__(self, id: int) -> Call[AnimeModel]:
+        url = f"{self.url}/anime/{id}?include={AnimeModel.INCLUDE}{query_fields(AnimeModel.INCLUDED_FIELDS)}"
+        return Call(url, Endpoint.ANIME, AnimeModel, ("anime", id))
+
+    def __manga__(self, id: int) -> Call[MangaModel]:
+        url = f"{self.url}/manga/{id}?include={MangaModel.INCLUDE}{query_fields(MangaModel.INCLUDED_FIELDS)}"
+        return Call(url, Endpoint.MANGA, MangaModel, ("manga", id))
+
+    def __character__(self, media: Media, id: int) -> Call[Union[AnimeCharacter, MangaCharacter]]:
+        url = f"{self.url}/media-characters/{id}/character" if media == Media.MANGA \
+            else f"{self.url}/media-characters/{id}/character?include=mediaCharacters.voices.person"
+        model = AnimeCharacter if media == Media.ANIME else MangaCharacter
+        return Call(url, Endpoint.CHARACTER, model, (f"{media.value}Characters", id))
+
+    def __franchises__(self, media: Media, id: int) -> Call[Tuple[Franchise]]:
+        _fields = ",".join(General.FIELDS.values())
+        url = f"{self.url}/media-relationships?filter[source_id]={id}&filter[source_type]={media.value.title()}&include=destination&sort=role" \
+            + query_fields({"mediaRelationships": "role,destination", "anime": _fields, "manga": _fields})
+        return Call(
+            url, Endpoint.FRANCHISES,
+            franchises_of,
+            (f"{media.value}Relationships", id)
+        )
+
+    def __characters_include__(self, media: Media) -> str:
+        if media == Media.MANGA: return "character" + query_fields({"mediaCharacters": "role,character"})
+        return "character,voices.person" + query_fields({
+            "mediaCharacters": "role,character,voices",
+            "characterVoices": "locale,person",
+            "people": "name,description,image"
+        })
+
+    def __cast_url__(self, media: Media, id: int, page: int) -> str:
+        return f"{self.url}/media-characters?filter[media_type]={media.value.title()}&filter[media_id]={id}" \
+            + f"&page[limit]={MAX_PAGE_LIMIT}&page[offset]={MAX_PAGE_LIMIT * (page - 1)}&sort=id" \
+            + f"&include={self.__characters_include__(media)}"
+
+    def __cast_urls__(self, media: Media, id: int, first: Dict[str, Any]) -> List[str]:
+        count = (first.get("meta", None) or {}).get("count", None) or 0
+        pages = -(-count // MAX_PAGE_LIMIT)
+        return [self.__cast_url__(media, id, page) for page in range(2, pages + 1)]
+
+    def __cast__(self, media: Media, id: int) -> Call[Tuple[Union[AnimeCharacter, MangaCharacter], ...]]:
+        model = AnimeCharacter if media == Media.ANIME else MangaCharacter
+        return Call(
+            self.__cast_url__(media, id, 1), Endpoint.CAST,
+            lambda data: cast_of(model, data),
+            (f"{media.value}Cast", id)
+        )
+
+    def __list__(
+        self, media: Media, endpoint: Endpoint, page: int,
+        filters: Dict[Filter, List[Union[Enum, int]]],
+        limit: int, fields: Optional[List[str]]
+    ) -> Call[SearchContainer]:
+        url = self.__list_url__(media, SORTS[endpoint], page, filters, limit, fields)
+        return Call(url, endpoint, lambda data: SearchContainer(data, [GeneralResult(d) for d in data["data"]], page, limit))
+
+    def __indexed__(
+        self, media: Media, query: str, page: int, limit: int, fields: Optional[List[str]]
+    ) -> Optional[SearchContainer]:
+        if self.index is None: return None
+        start = perf_counter()
+        container = self.index.search(media, query, page, limit, fields)
+        if not container.total_result: return None
+        self.__report__("hit", url=None, endpoint=Endpoint.SEARCH, source="index")
+        self.__report__("build", endpoint=Endpoint.SEARCH, elapsed=perf_counter() - start)
+        return container
+
+    def __search__(self, media: Media, query: str, page: int, limit: int, fields: Optional[List[str]]) -> Call[SearchContainer]:
+        offset = limit * (page - 1)
+        _fields = self.__get_fields__(media, fields)
+        url = f"{self.url}/{media.value}?filter[text]={query}&{_fields}page[limit]={limit}&page[offset]={offset}"
+        return Call(url, Endpoint.SEARCH, lambda data: SearchContainer(data, [GeneralResult(d) for d in data["data"]], page, limit))
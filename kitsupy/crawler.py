@@ -0,0 +1,98 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import codec
+from .enums import Media
+from .export import ExportProgress
+from .jsonapi import MAX_PAGE_LIMIT
+from .kitsu import Kitsu
+from .ratelimit import RateLimiter, SharedRateLimiter
+
+_client: Optional[Kitsu] = None
+
+def initialize(limiter: RateLimiter, url: Optional[str], workers: int) -> None:
+    global _client
+    _client = Kitsu(limiter=limiter, workers=workers)
+    if url: _client.url = url
+
+def hydrate(media: Media, ids: List[int]) -> Tuple[bytes, int, List[int]]:
+    fetch = _client.anime_many if media == Media.ANIME else _client.manga_many
+    batch = fetch(ids, _client.workers)
+    return codec.encode_lines(batch.results), len(batch.results), batch.missing
+
+class Crawler:
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        limiter: Optional[SharedRateLimiter] = None,
+        workers: Optional[int] = 8,
+        chunk_size: Optional[int] = MAX_PAGE_LIMIT * 10,
+        url: Optional[str] = None,
+        progress: Optional[Callable[[ExportProgress], None]] = None
+    ):
+        processes = processes if processes is not None else os.cpu_count() or 1
+        if processes <= 0 or workers <= 0 or chunk_size <= 0:
+            raise ValueError("processes, workers and chunk_size must be greater than 0")
+
+        self.processes = processes
+        self.limiter = limiter if limiter is not None else SharedRateLimiter()
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.url = url
+        self.progress = progress
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "Crawler":
+        return self
+
+    def __exit__(self, *excinfo: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None: executor.shutdown(wait=True)
+
+    def __executor__(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=initialize,
+                initargs=(self.limiter, self.url, self.workers)
+            )
+        return self._executor
+
+    def chunks(self, media: Media, ids: Iterable[int]) -> Iterator[Tuple[bytes, int, List[int]]]:
+        executor = self.__executor__()
+        ids = iter(ids)
+        running: Dict["Future[Tuple[bytes, int, List[int]]]", None] = {}
+        try:
+            while True:
+                while len(running) < self.processes * 2:
+                    chunk = [id for _, id in zip(range(self.chunk_size), ids)]
+                    if not chunk: break
+                    running[executor.submit(hydrate, media, chunk)] = None
+                if not running: return
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    yield future.result()
+        finally:
+            for future in running: future.cancel()
+
+    def crawl(self, media: Media, ids: Iterable[int], path: str) -> List[int]:
+        ids = list(ids)
+        count, missing, start = 0, [], time.monotonic()
+        with open(path, "wb") as file:
+            for lines, found, absent in self.chunks(media, ids):
+                file.write(lines)
+                count += found
+                missing.extend(absent)
+                if self.progress is not None:
+                    self.progress(ExportProgress(media, count + len(missing), len(ids), time.monotonic() - start, False))
+
+        if self.progress is not None:
+            self.progress(ExportProgress(media, count + len(missing), len(ids), time.monotonic() - start, True))
+        return sorted(missing)
@@ -1,3 +1,4 @@
 from .filters import *
 from .genres import Genres
-from .media import Media
\ No newline at end of file
+from .media import Media
+from .endpoint import Endpoint
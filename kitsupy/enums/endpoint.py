@@ -0,0 +1,14 @@
+from enum import unique, Enum
+
+@unique
+class Endpoint(Enum):
+    ANIME = "anime"
+    MANGA = "manga"
+    CHARACTER = "character"
+    FRANCHISES = "franchises"
+    CAST = "cast"
+    POPULARITY = "popularity"
+    TOP_RATE = "top_rate"
+    UPCOMING = "upcoming"
+    LATEST = "latest"
+    SEARCH = "search"
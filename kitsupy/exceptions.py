@@ -1,12 +1,12 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 class ApiException(Exception):
     def __init__(self, data: Dict[str, Any]):
         self._errors = data["errors"][0]
-        self.title = self._errors["title"]
-        self.detail = self._errors["detail"]
-        self.code = int(self._errors["code"])
-        self.status = int(self._errors["status"])
+        self.title = self._errors.get("title", None)
+        self.detail = self._errors.get("detail", None)
+        self.status = int(self._errors.get("status", 0))
+        self.code = int(self._errors.get("code", self.status))
         self.message = f"HTTP {self.status} {self.title} {self.detail}"
 
         super().__init__(self.message)
@@ -14,3 +14,7 @@ class ApiException(Exception):
 class KitsuException(ApiException):
     def __init__(self, data: Dict[str, Any]):
         super().__init__(data)
+
+    @classmethod
+    def from_status(cls, status: int, title: str, detail: Optional[str] = None) -> "KitsuException":
+        return cls({"errors": [{"title": title, "detail": detail, "code": status, "status": status}]})
@@ -0,0 +1,207 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import codec
+from .enums import Endpoint, Media
+from .jsonapi import MAX_PAGE_LIMIT
+from .kitsuasync import KitsuAsync
+from .models import GeneralResult
+
+class ExportProgress:
+    def __init__(self, media: Media, count: int, total: int, elapsed: float, done: bool):
+        self.media = media
+        self.count = count
+        self.total = total
+        self.elapsed = elapsed
+        self.done = done
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return f"ExportProgress({self.media.value}: {self.count}/{self.total}, {self.rate:.1f} records/s)"
+
+class JsonLinesWriter:
+    def __init__(self, directory: str, media: Media, state: Dict[str, Any], batch_size: int):
+        self.path = os.path.join(directory, f"{media.value}.jsonl")
+        self.file = open(self.path, "ab")
+        self.file.truncate(state.get("position", 0))
+        self.file.seek(0, os.SEEK_END)
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        return {"position": self.file.tell()}
+
+    def write(self, resources: List[Dict[str, Any]]) -> None:
+        self.file.write(codec.encode_lines(resources))
+
+    def commit(self, force: Optional[bool] = False) -> bool:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return True
+
+    def close(self) -> None:
+        self.file.close()
+
+class ParquetWriter:
+    def __init__(self, directory: str, media: Media, state: Dict[str, Any], batch_size: int):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("The parquet format requires the 'pyarrow' package") from None
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        images = pyarrow.map_(pyarrow.string(), pyarrow.string())
+        self.schema = pyarrow.schema([
+            ("id", pyarrow.int64()),
+            ("type", pyarrow.string()),
+            ("titles", images),
+            ("canonical_title", pyarrow.string()),
+            ("average_rating", pyarrow.float64()),
+            ("popularity_rank", pyarrow.int64()),
+            ("rating_rank", pyarrow.int64()),
+            ("subtype", pyarrow.string()),
+            ("status", pyarrow.string()),
+            ("poster_images", images),
+            ("cover_images", images)
+        ])
+        self.directory = os.path.join(directory, media.value)
+        self.batch_size = batch_size
+        self.part = state.get("part", 0)
+        self.rows: List[Dict[str, Any]] = []
+
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.startswith("part-") and int(name[5:10]) >= self.part:
+                os.remove(os.path.join(self.directory, name))
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        return {"part": self.part}
+
+    def write(self, resources: List[Dict[str, Any]]) -> None:
+        self.rows.extend(GeneralResult(resource).to_dict() for resource in resources)
+
+    def commit(self, force: Optional[bool] = False) -> bool:
+        if not self.rows or (len(self.rows) < self.batch_size and not force): return False
+        table = self.pa.Table.from_pylist(self.rows, schema=self.schema)
+        path = os.path.join(self.directory, f"part-{self.part:05d}.parquet")
+        self.pq.write_table(table, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+        self.part += 1
+        self.rows = []
+        return True
+
+    def close(self) -> None:
+        self.rows = []
+
+WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "parquet": ParquetWriter
+}
+
+class Exporter:
+    def __init__(
+        self,
+        client: KitsuAsync,
+        directory: str,
+        format: Optional[str] = "jsonl",
+        concurrency: Optional[int] = 4,
+        limit: Optional[int] = MAX_PAGE_LIMIT,
+        batch_size: Optional[int] = 5000,
+        progress: Optional[Callable[[ExportProgress], None]] = None
+    ):
+        if format not in WRITERS:
+            raise ValueError(f"Unknown format: {format}")
+
+        self.client = client
+        self.directory = directory
+        self.format = format
+        self.concurrency = concurrency
+        self.limit = limit
+        self.batch_size = batch_size
+        self.progress = progress
+        self.checkpoint_path = os.path.join(directory, f"checkpoint.{format}.json")
+        os.makedirs(directory, exist_ok=True)
+        self.checkpoint = self.__load__()
+
+    def __load__(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.checkpoint_path): return {}
+        with open(self.checkpoint_path, "rb") as file:
+            return codec.loads(file.read())
+
+    def __save__(self, media: Media, state: Dict[str, Any]) -> None:
+        self.checkpoint[media.value] = state
+        with open(f"{self.checkpoint_path}.tmp", "wb") as file:
+            file.write(codec.encode(self.checkpoint))
+        os.replace(f"{self.checkpoint_path}.tmp", self.checkpoint_path)
+
+    def reset(self) -> None:
+        self.checkpoint = {}
+        if os.path.exists(self.checkpoint_path): os.remove(self.checkpoint_path)
+
+    async def __page__(self, media: Media, page: int, limit: int) -> Dict[str, Any]:
+        url = self.client.__list_url__(media, "id", page, {}, limit, None, ["abbreviatedTitles"])
+        return await self.client.__fetch__(url, Endpoint.LATEST)
+
+    async def __export__(self, media: Media) -> int:
+        state = dict(self.checkpoint.get(media.value, None) or {"page": 1, "limit": self.limit, "count": 0, "writer": {}})
+        if state.get("done", False): return state["count"]
+
+        limit = state["limit"]
+        writer = WRITERS[self.format](self.directory, media, state["writer"], self.batch_size)
+        pending: Deque[Tuple[int, "asyncio.Future[Dict[str, Any]]"]] = deque()
+        next_page, total, exported, start = state["page"], None, 0, time.monotonic()
+        try:
+            while True:
+                while len(pending) < self.concurrency and (
+                    (total is None and not pending) or (total is not None and (next_page - 1) * limit < total)
+                ):
+                    pending.append((next_page, asyncio.ensure_future(self.__page__(media, next_page, limit))))
+                    next_page += 1
+                if not pending: break
+
+                page, task = pending.popleft()
+                data = await task
+                total = data["meta"]["count"]
+                resources = data["data"]
+                writer.write(resources)
+                exported += len(resources)
+                state.update(page=page + 1, count=state["count"] + len(resources))
+                if len(resources) < limit:
+                    state["done"] = True
+                if writer.commit():
+                    state["writer"] = writer.state
+                    self.__save__(media, state)
+
+                if self.progress is not None:
+                    self.progress(ExportProgress(media, state["count"], total, time.monotonic() - start, False))
+                if state.get("done", False): break
+            state["done"] = True
+        finally:
+            for _, task in pending: task.cancel()
+            if writer.commit(force=True) or state.get("done", False):
+                state["writer"] = writer.state
+                self.__save__(media, state)
+            writer.close()
+
+        if self.progress is not None:
+            self.progress(ExportProgress(media, state["count"], total or state["count"], time.monotonic() - start, True))
+        return state["count"]
+
+    async def export(self, *medias: Media) -> Dict[Media, int]:
+        medias = medias or (Media.ANIME, Media.MANGA)
+        tasks = [asyncio.ensure_future(self.__export__(media)) for media in medias]
+        try:
+            counts = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks: task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return dict(zip(medias, counts))
@@ -0,0 +1,210 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import codec
+from .models import GeneralResult
+from .models.base import General, convert_to, get_images
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMERIC: Tuple[str, ...] = ("id", "average_rating", "popularity_rank", "rating_rank")
+CATEGORICAL: Tuple[str, ...] = ("type", "subtype", "status")
+OBJECT: Tuple[str, ...] = ("titles", "canonical_title", "poster_images", "cover_images")
+COLUMNS: Tuple[str, ...] = General.__slots__
+
+def require_numpy() -> None:
+    if np is None: raise ImportError("ResultFrame requires the 'numpy' package")
+
+def nullable(value: Any) -> float:
+    return float("nan") if value is None else value
+
+class Categorical:
+    __slots__ = ("codes", "categories")
+    __hash__ = None
+
+    def __init__(self, codes: "np.ndarray", categories: List[Optional[str]]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def encode(cls, values: Sequence[Optional[str]]) -> "Categorical":
+        categories = list(dict.fromkeys(values))
+        lookup = {category: code for code, category in enumerate(categories)}
+        return cls(np.fromiter((lookup[value] for value in values), dtype=np.int16, count=len(values)), categories)
+
+    @classmethod
+    def concat(cls, parts: List["Categorical"]) -> "Categorical":
+        categories = list(dict.fromkeys(category for part in parts for category in part.categories))
+        lookup = {category: code for code, category in enumerate(categories)}
+        codes = [
+            np.array([lookup[category] for category in part.categories], dtype=np.int16)[part.codes]
+            if part.categories else part.codes
+            for part in parts
+        ]
+        return cls(np.concatenate(codes) if codes else np.empty(0, dtype=np.int16), categories)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: Any) -> "Categorical":
+        return Categorical(self.codes[index], self.categories)
+
+    def __lookup__(self, value: Optional[str]) -> int:
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+    def __eq__(self, value: Optional[str]) -> "np.ndarray":
+        return self.codes == self.__lookup__(value)
+
+    def __ne__(self, value: Optional[str]) -> "np.ndarray":
+        return self.codes != self.__lookup__(value)
+
+    def isin(self, values: Iterable[Optional[str]]) -> "np.ndarray":
+        table = np.zeros(len(self.categories) + 1, dtype=bool)
+        table[[self.__lookup__(value) for value in values]] = True
+        table[-1] = False
+        return table[self.codes]
+
+    def counts(self) -> Dict[Optional[str], int]:
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return {category: int(count) for category, count in zip(self.categories, counts) if count}
+
+    def decode(self) -> "np.ndarray":
+        categories = np.empty(len(self.categories), dtype=object)
+        categories[:] = self.categories
+        return categories[self.codes]
+
+    def sort_key(self) -> "np.ndarray":
+        order = sorted(range(len(self.categories)), key=lambda code: (self.categories[code] is None, self.categories[code] or ""))
+        ranks = np.empty(len(self.categories), dtype=np.int16)
+        ranks[order] = np.arange(len(self.categories), dtype=np.int16)
+        return ranks[self.codes]
+
+class ResultFrame:
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Dict[str, Any]):
+        require_numpy()
+        self.columns = columns
+
+    @classmethod
+    def __from_rows__(cls, rows: List[Tuple[Any, ...]]) -> "ResultFrame":
+        require_numpy()
+        values = dict(zip(COLUMNS, zip(*rows))) if rows else {name: () for name in COLUMNS}
+        columns: Dict[str, Any] = {
+            "id": np.array(values["id"], dtype=np.int64),
+            "average_rating": np.array([nullable(value) for value in values["average_rating"]], dtype=np.float64),
+            "popularity_rank": np.array([nullable(value) for value in values["popularity_rank"]], dtype=np.float64),
+            "rating_rank": np.array([nullable(value) for value in values["rating_rank"]], dtype=np.float64)
+        }
+        for name in CATEGORICAL: columns[name] = Categorical.encode(values[name])
+        for name in OBJECT:
+            column = np.empty(len(rows), dtype=object)
+            column[:] = list(values[name])
+            columns[name] = column
+        return cls(columns)
+
+    @classmethod
+    def from_resources(cls, resources: Iterable[Dict[str, Any]]) -> "ResultFrame":
+        rows = []
+        for resource in resources:
+            attributes = resource.get("attributes", {})
+            rows.append((
+                int(resource.get("id", None)), resource.get("type", None), attributes.get("titles", None),
+                attributes.get("canonicalTitle", None), convert_to(attributes.get("averageRating", None), float),
+                attributes.get("popularityRank", None), attributes.get("ratingRank", None),
+                attributes.get("subtype", None), attributes.get("status", None),
+                get_images(attributes, "posterImage"), get_images(attributes, "coverImage")
+            ))
+        return cls.__from_rows__(rows)
+
+    @classmethod
+    def from_results(cls, results: Iterable[GeneralResult]) -> "ResultFrame":
+        return cls.__from_rows__([
+            tuple(getattr(result, name) for name in COLUMNS)
+            for result in results
+        ])
+
+    @classmethod
+    def from_export(cls, path: str) -> "ResultFrame":
+        with open(path, "rb") as file:
+            return cls.from_resources(codec.loads(line) for line in file if line.strip())
+
+    @classmethod
+    def concat(cls, frames: Iterable["ResultFrame"]) -> "ResultFrame":
+        frames = list(frames)
+        if not frames: return cls.__from_rows__([])
+        return cls({
+            name: Categorical.concat([frame.columns[name] for frame in frames]) if name in CATEGORICAL
+            else np.concatenate([frame.columns[name] for frame in frames])
+            for name in COLUMNS
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str): return self.columns[key]
+        return self.take(key)
+
+    def __iter__(self) -> Iterator[GeneralResult]:
+        for index in range(len(self)): yield self.result(index)
+
+    def take(self, index: Any) -> "ResultFrame":
+        if isinstance(index, np.ndarray) and index.dtype == bool: index = np.flatnonzero(index)
+        return ResultFrame({name: column[index] for name, column in self.columns.items()})
+
+    def filter(self, mask: "np.ndarray") -> "ResultFrame":
+        return self.take(np.flatnonzero(mask))
+
+    def __sort_key__(self, by: str, descending: bool) -> "np.ndarray":
+        column = self.columns[by]
+        if by in CATEGORICAL: key = column.sort_key().astype(np.float64)
+        elif by in NUMERIC: key = column.astype(np.float64)
+        else: raise ValueError(f"Cannot sort by {by}")
+        key = -key if descending else key
+        return np.where(np.isnan(key), np.inf, key)
+
+    def argsort(self, by: str, descending: Optional[bool] = False) -> "np.ndarray":
+        return np.argsort(self.__sort_key__(by, descending), kind="stable")
+
+    def sort(self, by: str, descending: Optional[bool] = False) -> "ResultFrame":
+        return self.take(self.argsort(by, descending))
+
+    def top(self, k: int, by: str, descending: Optional[bool] = True) -> "ResultFrame":
+        key = self.__sort_key__(by, descending)
+        if k <= 0: return self.take(np.empty(0, dtype=np.intp))
+        if k >= len(key): return self.take(np.argsort(key, kind="stable"))
+
+        kth = np.partition(key, k - 1)[k - 1]
+        below = np.flatnonzero(key < kth)
+        index = np.sort(np.concatenate([below, np.flatnonzero(key == kth)[:k - len(below)]]))
+        return self.take(index[np.argsort(key[index], kind="stable")])
+
+    def result(self, index: int) -> GeneralResult:
+        result = GeneralResult.__new__(GeneralResult)
+        for name in COLUMNS:
+            value = self.columns[name]
+            if name in CATEGORICAL: value = value.categories[value.codes[index]]
+            else: value = value[index]
+            if name in NUMERIC:
+                value = None if value != value else (float(value) if name == "average_rating" else int(value))
+            setattr(result, name, value)
+        return result
+
+    def to_results(self) -> List[GeneralResult]:
+        return list(self)
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        return {
+            name: self.columns[name].decode().tolist() if name in CATEGORICAL
+            else [None if value != value else value for value in self.columns[name].tolist()]
+            for name in COLUMNS
+        }
+
+    def __repr__(self):
+        return f"ResultFrame({len(self)} rows)"
@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+
+from . import codec
+from .exceptions import KitsuException
+
+SIZES: Tuple[str, ...] = ("tiny", "small", "medium", "large", "original")
+KINDS: Tuple[str, ...] = ("poster", "cover")
+
+def pick_size(images: Optional[Dict[str, str]], size: str) -> Optional[Tuple[str, str]]:
+    if not images: return None
+    position = SIZES.index(size)
+    for candidate in SIZES[position:] + SIZES[:position][::-1]:
+        if images.get(candidate, None): return candidate, images[candidate]
+    return None
+
+def write_atomic(path: str, data: bytes) -> None:
+    with open(f"{path}.{os.getpid()}.tmp", "wb") as file:
+        file.write(data)
+    os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+class ImageCache:
+    def __init__(self, directory: str, max_age: Optional[float] = 7 * 24 * 60 * 60):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "urls"), exist_ok=True)
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.directory, "objects", sha256[:2], sha256[2:])
+
+    def __entry_path__(self, url: str) -> str:
+        return os.path.join(self.directory, "urls", f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self.__entry_path__(url)
+        if not os.path.exists(path): return None
+        with open(path, "rb") as file:
+            entry = codec.loads(file.read())
+        return entry if os.path.exists(self.path(entry["sha256"])) else None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return self.max_age is None or time.time() - entry["checked_at"] < self.max_age
+
+    def put(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> Dict[str, Any]:
+        sha256 = hashlib.sha256(body).hexdigest()
+        path = self.path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, body)
+        return self.touch(url, {"url": url, "sha256": sha256, "size": len(body), "etag": etag, "last_modified": last_modified})
+
+    def touch(self, url: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        entry = {**entry, "checked_at": time.time()}
+        write_atomic(self.__entry_path__(url), codec.encode(entry))
+        return entry
+
+class ImageResult:
+    __slots__ = ("id", "type", "kind", "size", "url", "path", "status", "error")
+
+    def __init__(
+        self, item: Any, kind: str, size: str, url: str,
+        path: Optional[str], status: str, error: Optional[Exception] = None
+    ):
+        self.id = getattr(item, "id", None)
+        self.type = getattr(item, "type", None)
+        self.kind = kind
+        self.size = size
+        self.url = url
+        self.path = path
+        self.status = status
+        self.error = error
+
+    def __repr__(self):
+        return f"ImageResult({self.type} {self.id} {self.kind}/{self.size}: {self.status})"
+
+class ImagePrefetcher:
+    def __init__(
+        self,
+        client: Any,
+        items: Any,
+        cache: ImageCache,
+        size: Optional[str] = "medium",
+        kinds: Optional[Tuple[str, ...]] = ("poster",),
+        concurrency: Optional[int] = 16
+    ):
+        if size not in SIZES:
+            raise ValueError(f"Unknown size: {size}")
+        if any(kind not in KINDS for kind in kinds):
+            raise ValueError(f"Unknown kinds: {', '.join(kind for kind in kinds if kind not in KINDS)}")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be greater than 0")
+
+        self.client = client
+        self.items = items
+        self.cache = cache
+        self.size = size
+        self.kinds = kinds
+        self.concurrency = concurrency
+        self.counts: Dict[str, int] = {"cached": 0, "revalidated": 0, "downloaded": 0, "error": 0}
+        self.bytes = 0
+
+    def __models__(self, items: Any) -> Iterator[Any]:
+        if hasattr(items, "results"): items = items.results
+        if not isinstance(items, Iterable): items = (items,)
+        for item in items:
+            if hasattr(item, "results"): yield from self.__models__(item)
+            else: yield item
+
+    def __jobs__(self) -> Iterator[Tuple[Any, str, str, str]]:
+        seen = set()
+        for item in self.__models__(self.items):
+            for kind in self.kinds:
+                picked = pick_size(getattr(item, f"{kind}_images", None), self.size)
+                if picked is None or picked[1] in seen: continue
+                seen.add(picked[1])
+                yield (item, kind) + picked
+
+    async def __fetch__(self, item: Any, kind: str, size: str, url: str) -> ImageResult:
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(None, self.cache.get, url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return ImageResult(item, kind, size, url, self.cache.path(entry["sha256"]), "cached")
+
+        headers = {}
+        if entry is not None and entry["etag"]: headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry["last_modified"]: headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = await self.client.transport.get(url, headers)
+        except self.client.transport.errors as ex:
+            return ImageResult(item, kind, size, url, None, "error", ex)
+
+        if response.status == 304 and entry is not None:
+            entry = await loop.run_in_executor(None, self.cache.touch, url, entry)
+            return ImageResult(item, kind, size, url, self.cache.path(entry["sha256"]), "revalidated")
+        if response.status != 200:
+            error = KitsuException.from_status(response.status, response.reason, url)
+            return ImageResult(item, kind, size, url, None, "error", error)
+
+        self.bytes += len(response.body)
+        entry = await loop.run_in_executor(
+            None, self.cache.put, url, response.body,
+            response.headers.get("ETag", None), response.headers.get("Last-Modified", None)
+        )
+        return ImageResult(item, kind, size, url, self.cache.path(entry["sha256"]), "downloaded")
+
+    def __aiter__(self) -> AsyncIterator[ImageResult]:
+        return self.__prefetch__()
+
+    async def __prefetch__(self) -> AsyncIterator[ImageResult]:
+        jobs = self.__jobs__()
+        running = set()
+        try:
+            while True:
+                for job in jobs:
+                    running.add(asyncio.ensure_future(self.__fetch__(*job)))
+                    if len(running) >= self.concurrency: break
+                if not running: return
+
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    self.counts[result.status] += 1
+                    yield result
+        finally:
+            for task in running: task.cancel()
+            if running: await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,181 @@
+import heapq
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from itertools import combinations
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import codec
+from .enums import Media
+from .models import GeneralResult, SearchContainer
+from .models.base import General
+from .store import SQLiteStore
+
+TOKEN = re.compile(r"\w+")
+SHORT_PREFIX = 2
+
+def normalize(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return TOKEN.findall(text.lower())
+
+def deletes(term: str, distance: int) -> Set[str]:
+    variants = set()
+    for n in range(1, min(distance, len(term) - 1) + 1):
+        for positions in combinations(range(len(term)), n):
+            variants.add("".join(char for i, char in enumerate(term) if i not in positions))
+    return variants
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    if abs(len(a) - len(b)) > limit: return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit: return limit + 1
+    return current[-1]
+
+def titles_of(resource: Dict[str, Any]) -> Iterator[str]:
+    attributes = resource.get("attributes", None) or {}
+    for title in (attributes.get("titles", None) or {}).values():
+        if title: yield title
+    if attributes.get("canonicalTitle", None): yield attributes["canonicalTitle"]
+    for title in attributes.get("abbreviatedTitles", None) or []:
+        if title: yield title
+
+class Partition:
+    __slots__ = ("resources", "postings", "terms", "short", "deletes")
+
+    def __init__(self, resources: Dict[str, Dict[str, Any]], max_typos: int):
+        rank = lambda resource: (
+            (resource.get("attributes", None) or {}).get("popularityRank", None) or float("inf"),
+            int(resource["id"])
+        )
+        self.resources = sorted(resources.values(), key=rank)
+        self.postings: Dict[str, Set[int]] = {}
+        for position, resource in enumerate(self.resources):
+            for title in titles_of(resource):
+                for term in normalize(title):
+                    self.postings.setdefault(term, set()).add(position)
+
+        self.terms = sorted(self.postings)
+        self.short: Dict[str, Set[int]] = {}
+        for term, positions in self.postings.items():
+            for n in range(1, min(SHORT_PREFIX, len(term)) + 1):
+                self.short.setdefault(term[:n], set()).update(positions)
+
+        self.deletes: Dict[str, List[str]] = {}
+        if max_typos > 0:
+            for term in self.terms:
+                for variant in deletes(term, max_typos):
+                    self.deletes.setdefault(variant, []).append(term)
+
+    def prefix(self, token: str) -> Set[int]:
+        if len(token) <= SHORT_PREFIX: return self.short.get(token, set())
+        positions: Set[int] = set()
+        for i in range(bisect_left(self.terms, token), len(self.terms)):
+            if not self.terms[i].startswith(token): break
+            positions.update(self.postings[self.terms[i]])
+        return positions
+
+    def fuzzy(self, token: str, max_typos: int) -> Set[int]:
+        candidates = set(self.deletes.get(token, ()))
+        for variant in deletes(token, max_typos):
+            if variant in self.postings: candidates.add(variant)
+            candidates.update(self.deletes.get(variant, ()))
+
+        positions: Set[int] = set()
+        for term in candidates:
+            if edit_distance(token, term, max_typos) <= max_typos: positions.update(self.postings[term])
+        return positions
+
+class SearchIndex:
+    def __init__(self, max_typos: Optional[int] = 1, min_typo_length: Optional[int] = 4):
+        self.max_typos = max_typos
+        self.min_typo_length = min_typo_length
+        self._resources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._partitions: Dict[str, Partition] = {}
+        self._lock = Lock()
+
+    @classmethod
+    def from_export(cls, directory: str, **options: Any) -> "SearchIndex":
+        index = cls(**options)
+        for media in Media:
+            path = os.path.join(directory, f"{media.value}.jsonl")
+            if os.path.exists(path): index.load(path)
+        return index
+
+    @classmethod
+    def from_store(cls, store: SQLiteStore, **options: Any) -> "SearchIndex":
+        index = cls(**options)
+        for media in Media:
+            index.add(document["data"] for document in store.documents(media.value))
+        return index
+
+    def __len__(self) -> int:
+        return sum(len(resources) for resources in self._resources.values())
+
+    def add(self, resources: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for resource in resources:
+                if resource.get("type", None) not in ("anime", "manga"): continue
+                self._resources.setdefault(resource["type"], {})[resource["id"]] = resource
+                self._partitions.pop(resource["type"], None)
+
+    def load(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self.add(codec.loads(line) for line in file if line.strip())
+
+    def __partition__(self, media: Media) -> Optional[Partition]:
+        with self._lock:
+            partition = self._partitions.get(media.value, None)
+            if partition is None and media.value in self._resources:
+                partition = self._partitions[media.value] = Partition(self._resources[media.value], self.max_typos)
+            return partition
+
+    def __positions__(self, partition: Partition, query: str) -> Set[int]:
+        tokens = normalize(query)
+        if not tokens: return set()
+
+        matches = None
+        for n, token in enumerate(tokens):
+            positions = partition.prefix(token) if n == len(tokens) - 1 else partition.postings.get(token, set())
+            if not positions and self.max_typos > 0 and len(token) >= self.min_typo_length:
+                positions = partition.fuzzy(token, self.max_typos)
+            matches = positions if matches is None else matches & positions
+            if not matches: return set()
+        return matches
+
+    def match(self, media: Media, query: str, offset: Optional[int] = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        partition = self.__partition__(media)
+        if partition is None: return [], 0
+
+        positions = self.__positions__(partition, query)
+        selected = sorted(positions) if limit is None else heapq.nsmallest(offset + limit, positions)
+        return [partition.resources[position] for position in selected[offset:]], len(positions)
+
+    def search(
+        self, media: Media, query: str,
+        page: Optional[int] = 1,
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
+    ) -> SearchContainer:
+        if fields is not None:
+            unknown = [field for field in fields if field not in General.FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        resources, count = self.match(media, query, limit * (page - 1), limit)
+        if fields is not None:
+            names = {General.FIELDS[field] for field in fields}
+            resources = [
+                {**resource, "attributes": {name: value for name, value in resource["attributes"].items() if name in names}}
+                for resource in resources
+            ]
+        return SearchContainer({"meta": {"count": count}}, [GeneralResult(resource) for resource in resources], page, limit)
@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import codec
+from .exceptions import KitsuException
+
+MAX_PAGE_LIMIT = 20
+
+def query_fields(fields: Dict[str, str]) -> str:
+    return "".join(f"&fields[{type}]={names}" for type, names in fields.items())
+
+def linkage(resource: Dict[str, Any]) -> List[Dict[str, Any]]:
+    refs = []
+    for relationship in (resource.get("relationships", None) or {}).values():
+        data = relationship.get("data", None) if isinstance(relationship, dict) else None
+        if isinstance(data, dict): refs.append(data)
+        elif isinstance(data, list): refs.extend(data)
+    return refs
+
+class Resolver:
+    def __init__(self, included: List[Dict[str, Any]]):
+        self.positions: Dict[Tuple[str, str], int] = {}
+        self.resources: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.types: Dict[str, List[Dict[str, Any]]] = {}
+        for position, resource in enumerate(included or []):
+            key = (resource["type"], resource["id"])
+            self.positions[key] = position
+            self.resources[key] = resource
+            self.types.setdefault(resource["type"], []).append(resource)
+
+    def get(self, type: str, id: str) -> Optional[Dict[str, Any]]:
+        return self.resources.get((type, str(id)), None)
+
+    def of_type(self, type: str) -> List[Dict[str, Any]]:
+        return self.types.get(type, [])
+
+    def related(self, resource: Dict[str, Any], name: str) -> List[Dict[str, Any]]:
+        relationship = (resource.get("relationships", None) or {}).get(name, None) or {}
+        data = relationship.get("data", None)
+        if data is None: return []
+        if isinstance(data, dict): data = [data]
+        return [
+            self.resources[(ref["type"], ref["id"])] for ref in data
+            if (ref["type"], ref["id"]) in self.resources
+        ]
+
+    def reachable(self, resource: Dict[str, Any]) -> List[Dict[str, Any]]:
+        seen = set()
+        stack = [resource]
+        while stack:
+            for ref in linkage(stack.pop()):
+                key = (ref["type"], ref["id"])
+                if key in seen or key not in self.resources: continue
+                seen.add(key)
+                stack.append(self.resources[key])
+        return [self.resources[key] for key in sorted(seen, key=self.positions.__getitem__)]
+
+def split_document(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    resolver = Resolver(document.get("included", None) or [])
+    return {
+        resource["id"]: {"data": resource, "included": resolver.reachable(resource)}
+        for resource in document.get("data", None) or []
+    }
+
+def merge_documents(documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    data, included = [], {}
+    for document in documents:
+        data.extend(document.get("data", None) or [])
+        for resource in document.get("included", None) or []:
+            included.setdefault((resource["type"], resource["id"]), resource)
+    return {"data": data, "included": list(included.values()), "meta": {"count": len(data)}}
+
+def decode_response(status: int, reason: str, body: bytes) -> Dict[str, Any]:
+    try:
+        data = codec.loads(body) if body else None
+    except ValueError:
+        data = None
+
+    if isinstance(data, dict) and status == 200: return data
+    if isinstance(data, dict) and data.get("errors", None): raise KitsuException(data)
+    if status == 200:
+        raise KitsuException.from_status(status, reason, "The response body is not a JSON:API document")
+    raise KitsuException.from_status(status, reason, body[:200].decode("utf-8", "replace").strip())
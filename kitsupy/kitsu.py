@@ -1,159 +1,305 @@
 from enum import Enum
-from json import dumps
-from requests import Session
-from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+from threading import Lock, local
+from time import perf_counter, sleep, time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
-from .exceptions import KitsuException
+from .cache import ResponseCache
+from .core import Call, KitsuCore
+from .index import SearchIndex
+from .jsonapi import merge_documents, query_fields, split_document
+from .loader import Loader
+from .ratelimit import RateLimiter, RetryPolicy
+from .store import SQLiteStore
+from .transports import RequestsTransport, Transport
 from .models import *
+from .models.character import character_documents
 from .enums import *
 
-class Kitsu:
-    def __init__(self):
-        self.url = "https://kitsu.io/api/edge"
-        self.headers = {
-            "Accept": "application/vnd.api+json",
-            "Content-Type": "application/vnd.api+json"
-        }
-        self.session = Session()
-        self.session.headers.update(self.headers)        
-
-    def __fetch__(self, url) -> Dict[str, Any]:
-        response = self.session.get(url)
-        data = response.json()
-        if response.status_code != 200:
-            raise KitsuException(data)
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+T = TypeVar("T")
+KitsuT = TypeVar("KitsuT", bound="Kitsu")
+
+class Kitsu(KitsuCore):
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        store: Optional[SQLiteStore] = None,
+        limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        metrics: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        transport: Optional[Transport] = None,
+        workers: Optional[int] = 8,
+        index: Optional[SearchIndex] = None
+    ):
+        if workers <= 0:
+            raise ValueError("workers must be greater than 0")
+
+        super().__init__(cache, store, limiter, retry, metrics, index)
+        self.transport = transport if transport is not None else RequestsTransport()
+        self.workers = workers
+        self._pools: Dict[Tuple[str, int], "ThreadPoolExecutor"] = {}
+        self._local = local()
+        self._lock = Lock()
+        self.loader = Loader(self)
+
+    def __enter__(self: KitsuT) -> KitsuT:
+        return self
+
+    def __exit__(self, *excinfo: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools: pool.shutdown(wait=True)
+        self.transport.close()
+
+    def batch(self) -> Loader:
+        return self.loader
+
+    def __pool__(self, kind: str, workers: int) -> "ThreadPoolExecutor":
+        from concurrent.futures import ThreadPoolExecutor
+        with self._lock:
+            pool = self._pools.get((kind, workers), None)
+            if pool is None:
+                pool = self._pools[(kind, workers)] = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix=f"kitsu-{kind}",
+                    initializer=setattr,
+                    initargs=(self._local, "pool", kind)
+                )
+            return pool
+
+    def __fetch__(self, url: str, endpoint: Endpoint) -> Dict[str, Any]:
+        data = self.__cached__(url, endpoint)
+        if data is not None: return data
+
+        data = self.__request__(url, endpoint)
+        if self.cache is not None: self.cache.set(url, data, endpoint)
         return data
 
-    def __get_filters__(self, media: Media, filters: Dict[Filter, List[Union[Enum, int]]]) -> str:
-        to_string = lambda iterable, sep: sep.join(iterable)
-        is_type = lambda iterable, t: all(isinstance(value, t) for value in iterable)
-        in_range = lambda iterable, _min, _max: all(n >= _min and n <= _max for n in iterable)
-
-        temp = {}
-        for key, values in filters.items():
-            if key == Filter.AGE_RATING and media == Media.ANIME:
-                aux = [value.value for value in values if value in AgeRating]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.AVERAGE_RATING and is_type(values, int) and in_range(values, 5, 100):
-                if len(values) == 1: temp[key.value] = f"{values[0]}.."
-                elif len(values) > 1: temp[key.value] = to_string([f"{values[0]}", f"{values[-1]}"], "..")
-
-            if key == Filter.GENRES:
-                aux = [value.name.lower().replace("_", "-") for value in values if value in Genres]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.SEASON and media == Media.ANIME:
-                aux = [value.value for value in values if value in Season]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.SUBTYPE:
-                if media == Media.ANIME:
-                    aux = [value.value for value in values if value in AnimeSubtype]
-                if media == Media.MANGA:
-                    aux = [value.value for value in values if value in MangaSubtype]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.YEAR and is_type(values, int) and in_range(values, 1868, 2030):
-                if len(values) == 1: temp[key.value] = f"{values[0]}.."
-                elif len(values) > 1: temp[key.value] = to_string([f"{values[0]}", f"{values[-1]}"], "..")
-
-        _filter = ""
-        for key in sorted(temp.keys()):
-            if temp[key]: _filter += f"filter[{key}]={temp[key]}&"
-        return _filter
-    
+    def __request__(self, url: str, endpoint: Endpoint) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                waited = self.limiter.acquire()
+                if waited > 0: self.__report__("throttle", url=url, endpoint=endpoint, wait=waited)
+
+            self.__report__("request", url=url, endpoint=endpoint, attempt=attempt)
+            started_at, start = time(), perf_counter()
+            try:
+                response = self.transport.get(url, self.headers)
+            except self.transport.errors as ex:
+                delay = self.__failed__(url, endpoint, attempt, ex, started_at, perf_counter() - start)
+                if delay is None: raise
+            else:
+                delay, data = self.__response__(url, endpoint, attempt, response, started_at, perf_counter() - start)
+                if delay is None: return data
+
+            sleep(delay)
+            attempt += 1
+
+    def __execute__(self, call: Call[T]) -> T:
+        data = self.__stored__(call)
+        if data is None:
+            data = self.__fetch__(call.url, call.endpoint)
+            self.__store__(call, data)
+        return self.__build__(call.endpoint, lambda: self.__bind__(call.parse(data)))
+
+    def __fetch_many__(
+        self, type: str, ids: List[int], include: str, endpoint: Endpoint, workers: int,
+        path: Optional[str] = None, split: Callable[[Dict[str, Any]], Dict[str, Dict[str, Any]]] = split_document
+    ) -> Dict[str, Dict[str, Any]]:
+        documents, pending = self.__pending__(type, ids, endpoint)
+        urls = self.__many_urls__(path or type, pending, include)
+        if not urls: return documents
+
+        for data in self.__pool__("io", workers).map(lambda url: self.__fetch__(url, endpoint), urls):
+            self.__collect__(type, documents, data, split)
+        return documents
+
+    def __iterate__(self, fetch_page: Callable[[int], SearchContainer], max_results: Optional[int]) -> Iterator[GeneralResult]:
+        count, page = 0, 1
+        executor = self.__pool__("io", self.workers)
+        future = executor.submit(fetch_page, page)
+        try:
+            while future is not None:
+                container = future.result()
+                page += 1
+                future = None
+                fetched = count + len(container.results)
+                if container.results and page <= container.total_page \
+                    and (max_results is None or fetched < max_results):
+                    future = executor.submit(fetch_page, page)
+
+                for result in container.results:
+                    if max_results is not None and count >= max_results: return
+                    count += 1
+                    yield result
+        finally:
+            if future is not None: future.cancel()
+
+    def map(
+        self, method: Union[str, Callable[..., T]], args: Iterable[Any],
+        workers: Optional[int] = None
+    ) -> List[Union[T, Exception]]:
+        if isinstance(method, str):
+            if method.startswith("_") or not callable(getattr(self, method, None)):
+                raise ValueError(f"Unknown method: {method}")
+            method = getattr(self, method)
+
+        def call(arg: Any) -> Union[T, Exception]:
+            try:
+                return method(*arg) if isinstance(arg, tuple) else method(arg)
+            except Exception as ex:
+                return ex
+
+        if getattr(self._local, "pool", None) == "map": return [call(arg) for arg in args]
+        return list(self.__pool__("map", workers or self.workers).map(call, args))
+
     def anime(self, id: int) -> AnimeModel:
-        url = f"{self.url}/anime/{id}?include=genres,animeProductions.producer,characters"
-        data = self.__fetch__(url)
-        return AnimeModel(data)
+        return self.__execute__(self.__anime__(id))
     
     def manga(self, id: int) -> MangaModel:
-        url = f"{self.url}/manga/{id}?include=genres,characters"
-        data = self.__fetch__(url)
-        return MangaModel(data)
+        return self.__execute__(self.__manga__(id))
     
-    def character(self, media: Media, id: int) -> Union[AnimeCharacter, MangaCharacter]:        
-        url = f"{self.url}/media-characters/{id}/character" if media == Media.MANGA \
-            else f"{self.url}/media-characters/{id}/character?include=mediaCharacters.voices.person"
+    def anime_many(self, ids: List[int], workers: Optional[int] = 8) -> BatchContainer:
+        documents = self.__fetch_many__("anime", ids, AnimeModel.INCLUDE + query_fields(AnimeModel.INCLUDED_FIELDS), Endpoint.ANIME, workers)
+        return self.__build__(Endpoint.ANIME, lambda: self.__batch__(AnimeModel, ids, documents))
 
-        data = self.__fetch__(url)
-        if media == Media.ANIME: return AnimeCharacter(data)
-        if media == Media.MANGA: return MangaCharacter(data)
+    def manga_many(self, ids: List[int], workers: Optional[int] = 8) -> BatchContainer:
+        documents = self.__fetch_many__("manga", ids, MangaModel.INCLUDE + query_fields(MangaModel.INCLUDED_FIELDS), Endpoint.MANGA, workers)
+        return self.__build__(Endpoint.MANGA, lambda: self.__batch__(MangaModel, ids, documents))
+
+    def characters_many(self, media: Media, ids: List[int], workers: Optional[int] = 8) -> BatchContainer:
+        model = AnimeCharacter if media == Media.ANIME else MangaCharacter
+        documents = self.__fetch_many__(
+            f"{media.value}Characters", ids, self.__characters_include__(media), Endpoint.CHARACTER, workers,
+            "media-characters", character_documents
+        )
+        return self.__build__(Endpoint.CHARACTER, lambda: self.__batch__(model, ids, documents))
+
+    def character(self, media: Media, id: int) -> Union[AnimeCharacter, MangaCharacter]:
+        return self.__execute__(self.__character__(media, id))
 
     def franchises(self, media: Media, id: int) -> Tuple[Franchise]:
-        url = f"{self.url}/media-relationships?filter[source_id]={id}&filter[source_type]={media.value.title()}&include=destination&sort=role"
-        data = self.__fetch__(url)
-        return tuple(Franchise(root, _data) for root, _data in zip(data["data"], data["included"]))
+        return self.__execute__(self.__franchises__(media, id))
+
+    def franchise_graph(
+        self, media: Media, id: int,
+        max_depth: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> FranchiseGraph:
+        graph = FranchiseGraph(media, id)
+        level, depth = [(media, id)], 0
+        while level and (max_depth is None or depth < max_depth):
+            results = self.map(self.franchises, level, workers)
+            for result in results:
+                if isinstance(result, Exception): raise result
+            level = graph.expand(level, results)
+            depth += 1
+        return graph
+
+    def cast(self, media: Media, id: int, workers: Optional[int] = 8) -> Tuple[Union[AnimeCharacter, MangaCharacter], ...]:
+        call = self.__cast__(media, id)
+        data = self.__stored__(call)
+        if data is None:
+            first = self.__fetch__(call.url, call.endpoint)
+            urls = self.__cast_urls__(media, id, first)
+            pages = [first]
+            if urls: pages.extend(self.__pool__("io", workers).map(lambda url: self.__fetch__(url, call.endpoint), urls))
+            data = merge_documents(pages)
+            self.__store__(call, data)
+        return self.__build__(call.endpoint, lambda: self.__bind__(call.parse(data)))
 
     def popularity(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        url = ""
-        offset = limit * (page - 1)
-        _filters = self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-user_count"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-user_count"
-        data = self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
-    
+        return self.__execute__(self.__list__(media, Endpoint.POPULARITY, page, filters, limit, fields))
+
     def top_rate(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        offset = limit * (page - 1)
-        _filters = self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-averageRating"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-averageRating"
-        data = self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
+        return self.__execute__(self.__list__(media, Endpoint.TOP_RATE, page, filters, limit, fields))
 
     def upcoming(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        offset = limit * (page - 1)
-        _filters = self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-startDate"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-startDate"
-        data = self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
+        return self.__execute__(self.__list__(media, Endpoint.UPCOMING, page, filters, limit, fields))
 
     def latest(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        offset = limit * (page - 1)
-        _filters = self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-created_at"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-created_at"
-        data = self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
-
-    def search(self, media: Media, query: str, page: Optional[int] = 1, limit: Optional[int] = 10) -> SearchContainer:
-        offset = limit * (page - 1)
-        url = f"{self.url}/{media.value}?filter[text]={query}&page[limit]={limit}&page[offset]={offset}"
-        data = self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
+        return self.__execute__(self.__list__(media, Endpoint.LATEST, page, filters, limit, fields))
+
+    def search(
+        self, media: Media, query: str,
+        page: Optional[int] = 1,
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
+    ) -> SearchContainer:
+        container = self.__indexed__(media, query, page, limit, fields)
+        if container is not None: return container
+        return self.__execute__(self.__search__(media, query, page, limit, fields))
+
+    def iter_popularity(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.popularity(media, page, filters, limit, fields), max_results)
+
+    def iter_top_rate(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.top_rate(media, page, filters, limit, fields), max_results)
+
+    def iter_upcoming(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.upcoming(media, page, filters, limit, fields), max_results)
+
+    def iter_latest(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.latest(media, page, filters, limit, fields), max_results)
+
+    def iter_search(
+        self, media: Media, query: str,
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.search(media, query, page, limit, fields), max_results)
@@ -1,23 +1,50 @@
 import asyncio
-from aiohttp import ClientSession
 from enum import Enum
-from json import dumps
-from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+from time import perf_counter, time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
-from .exceptions import KitsuException
+from .cache import ResponseCache
+from .core import Call, KitsuCore
+from .images import ImageCache, ImagePrefetcher
+from .index import SearchIndex
+from .jsonapi import merge_documents, query_fields, split_document
+from .loader import AsyncLoader
+from .ratelimit import RateLimiter, RetryPolicy
+from .scan import Scan
+from .store import SQLiteStore
+from .transports import AiohttpTransport, AsyncTransport
 from .models import *
+from .models.character import character_documents
 from .enums import *
 
 KitsuAsyncT = TypeVar("KitsuAsyncT", bound="KitsuAsync")
+T = TypeVar("T")
 
-class KitsuAsync:
-    def __init__(self):
-        self.url = "https://kitsu.io/api/edge"
-        self.headers = {
-            "Accept": "application/vnd.api+json",
-            "Content-Type": "application/vnd.api+json"
-        }
-        self.session = None
+class KitsuAsync(KitsuCore):
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        store: Optional[SQLiteStore] = None,
+        max_concurrency: Optional[int] = 32,
+        limit: Optional[int] = 100,
+        limit_per_host: Optional[int] = 0,
+        keepalive_timeout: Optional[float] = 30.0,
+        limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        metrics: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        transport: Optional[AsyncTransport] = None,
+        index: Optional[SearchIndex] = None
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        super().__init__(cache, store, limiter, retry, metrics, index)
+        self.max_concurrency = max_concurrency
+        self.transport = transport if transport is not None \
+            else AiohttpTransport(limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout)
+        self._semaphore = None
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self.loader = AsyncLoader(self)
 
     async def __aenter__(self: KitsuAsyncT) -> KitsuAsyncT:
         return self
@@ -26,152 +53,237 @@ class KitsuAsync:
         await self.close()
 
     async def close(self):
-        if self.session is not None:
-            await self.session.close()
-
-    async def __get_session__(self) -> ClientSession:
-        if self.session is None:
-            self.session = ClientSession(headers=self.headers)
-        return self.session
-
-    async def __fetch__(self, url: str) -> Dict[str, Any]:
-        session = await self.__get_session__()
-        response = await session.get(url)
-        data = await response.json()
-        if response.status != 200:
-            raise KitsuException(data)
-        return data
-
-    async def __get_filters__(self, media: Media, filters: Dict[Filter, List[Union[Enum, int]]]) -> str:
-        to_string = lambda iterable, sep: sep.join(iterable)
-        is_type = lambda iterable, t: all(isinstance(value, t) for value in iterable)
-        in_range = lambda iterable, _min, _max: all(n >= _min and n <= _max for n in iterable)
-
-        temp = {}
-        for key, values in filters.items():
-            if key == Filter.AGE_RATING and media == Media.ANIME:
-                aux = [value.value for value in values if value in AgeRating]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.AVERAGE_RATING and is_type(values, int) and in_range(values, 5, 100):
-                if len(values) == 1: temp[key.value] = f"{values[0]}.."
-                elif len(values) > 1: temp[key.value] = to_string([f"{values[0]}", f"{values[-1]}"], "..")
-
-            if key == Filter.GENRES:
-                aux = [value.name.lower().replace("_", "-") for value in values if value in Genres]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.SEASON and media == Media.ANIME:
-                aux = [value.value for value in values if value in Season]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.SUBTYPE:
-                if media == Media.ANIME:
-                    aux = [value.value for value in values if value in AnimeSubtype]
-                if media == Media.MANGA:
-                    aux = [value.value for value in values if value in MangaSubtype]
-                temp[key.value] = to_string(aux, ",")
-
-            if key == Filter.YEAR and is_type(values, int) and in_range(values, 1868, 2030):
-                if len(values) == 1: temp[key.value] = f"{values[0]}.."
-                elif len(values) > 1: temp[key.value] = to_string([f"{values[0]}", f"{values[-1]}"], "..")
-
-        _filter = ""
-        for key in sorted(temp.keys()):
-            if temp[key]: _filter += f"filter[{key}]={temp[key]}&"
-        return _filter
-    
+        await self.transport.close()
+        self._semaphore = None
+        self._inflight = {}
+
+    async def __fetch__(self, url: str, endpoint: Endpoint) -> Dict[str, Any]:
+        data = self.__cached__(url, endpoint)
+        if data is not None: return data
+
+        task = self._inflight.get(url, None)
+        if task is None:
+            task = asyncio.ensure_future(self.__request__(url, endpoint))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def __request__(self, url: str, endpoint: Endpoint) -> Dict[str, Any]:
+        if self._semaphore is None: self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                waited = await self.limiter.acquire_async()
+                if waited > 0: self.__report__("throttle", url=url, endpoint=endpoint, wait=waited)
+
+            try:
+                async with self._semaphore:
+                    self.__report__("request", url=url, endpoint=endpoint, attempt=attempt)
+                    started_at, start = time(), perf_counter()
+                    response = await self.transport.get(url, self.headers)
+            except self.transport.errors as ex:
+                delay = self.__failed__(url, endpoint, attempt, ex, started_at, perf_counter() - start)
+                if delay is None: raise
+            else:
+                delay, data = self.__response__(url, endpoint, attempt, response, started_at, perf_counter() - start)
+                if delay is None:
+                    if self.cache is not None: self.cache.set(url, data, endpoint)
+                    return data
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __execute__(self, call: Call[T]) -> T:
+        data = self.__stored__(call)
+        if data is None:
+            data = await self.__fetch__(call.url, call.endpoint)
+            self.__store__(call, data)
+        return self.__build__(call.endpoint, lambda: self.__bind__(call.parse(data)))
+
+    async def __fetch_many__(
+        self, type: str, ids: List[int], include: str, endpoint: Endpoint,
+        path: Optional[str] = None, split: Callable[[Dict[str, Any]], Dict[str, Dict[str, Any]]] = split_document
+    ) -> Dict[str, Dict[str, Any]]:
+        documents, pending = self.__pending__(type, ids, endpoint)
+        urls = self.__many_urls__(path or type, pending, include)
+        for data in await asyncio.gather(*(self.__fetch__(url, endpoint) for url in urls)):
+            self.__collect__(type, documents, data, split)
+        return documents
+
+    async def __iterate__(
+        self, fetch_page: Callable[[int], Awaitable[SearchContainer]], max_results: Optional[int]
+    ) -> AsyncIterator[GeneralResult]:
+        count, page = 0, 1
+        task = asyncio.ensure_future(fetch_page(page))
+        try:
+            while task is not None:
+                container = await task
+                page += 1
+                task = None
+                fetched = count + len(container.results)
+                if container.results and page <= container.total_page \
+                    and (max_results is None or fetched < max_results):
+                    task = asyncio.ensure_future(fetch_page(page))
+
+                for result in container.results:
+                    if max_results is not None and count >= max_results: return
+                    count += 1
+                    yield result
+        finally:
+            if task is not None: task.cancel()
+
     async def anime(self, id: int) -> AnimeModel:
-        url = f"{self.url}/anime/{id}?include=genres,animeProductions.producer,characters"
-        data = await self.__fetch__(url)
-        return AnimeModel(data)
+        return await self.__execute__(self.__anime__(id))
 
     async def manga(self, id: int) -> MangaModel:
-        url = f"{self.url}/manga/{id}?include=genres,characters"
-        data = await self.__fetch__(url)
-        return MangaModel(data)
+        return await self.__execute__(self.__manga__(id))
+
+    async def anime_many(self, ids: List[int]) -> BatchContainer:
+        documents = await self.__fetch_many__("anime", ids, AnimeModel.INCLUDE + query_fields(AnimeModel.INCLUDED_FIELDS), Endpoint.ANIME)
+        return self.__build__(Endpoint.ANIME, lambda: self.__batch__(AnimeModel, ids, documents))
 
-    async def character(self, media: Media, id: int) -> Union[AnimeCharacter, MangaCharacter]:        
-        url = f"{self.url}/media-characters/{id}/character" if media == Media.MANGA \
-            else f"{self.url}/media-characters/{id}/character?include=mediaCharacters.voices.person"
+    async def manga_many(self, ids: List[int]) -> BatchContainer:
+        documents = await self.__fetch_many__("manga", ids, MangaModel.INCLUDE + query_fields(MangaModel.INCLUDED_FIELDS), Endpoint.MANGA)
+        return self.__build__(Endpoint.MANGA, lambda: self.__batch__(MangaModel, ids, documents))
 
-        data = await self.__fetch__(url)
-        if media == Media.ANIME: return AnimeCharacter(data)
-        if media == Media.MANGA: return MangaCharacter(data)
+    async def characters_many(self, media: Media, ids: List[int]) -> BatchContainer:
+        model = AnimeCharacter if media == Media.ANIME else MangaCharacter
+        documents = await self.__fetch_many__(
+            f"{media.value}Characters", ids, self.__characters_include__(media), Endpoint.CHARACTER,
+            "media-characters", character_documents
+        )
+        return self.__build__(Endpoint.CHARACTER, lambda: self.__batch__(model, ids, documents))
+
+    async def character(self, media: Media, id: int) -> Union[AnimeCharacter, MangaCharacter]:
+        return await self.__execute__(self.__character__(media, id))
 
     async def franchises(self, media: Media, id: int) -> Tuple[Franchise]:
-        url = f"{self.url}/media-relationships?filter[source_id]={id}&filter[source_type]={media.value.title()}&include=destination&sort=role"
-        data = await self.__fetch__(url)
-        return tuple(Franchise(root, _data) for root, _data in zip(data["data"], data["included"]))
+        return await self.__execute__(self.__franchises__(media, id))
+
+    async def cast(self, media: Media, id: int) -> Tuple[Union[AnimeCharacter, MangaCharacter], ...]:
+        call = self.__cast__(media, id)
+        data = self.__stored__(call)
+        if data is None:
+            first = await self.__fetch__(call.url, call.endpoint)
+            urls = self.__cast_urls__(media, id, first)
+            pages = [first, *await asyncio.gather(*(self.__fetch__(url, call.endpoint) for url in urls))]
+            data = merge_documents(pages)
+            self.__store__(call, data)
+        return self.__build__(call.endpoint, lambda: self.__bind__(call.parse(data)))
+
+    async def franchise_graph(self, media: Media, id: int, max_depth: Optional[int] = None) -> FranchiseGraph:
+        graph = FranchiseGraph(media, id)
+        level, depth = [(media, id)], 0
+        while level and (max_depth is None or depth < max_depth):
+            results = await asyncio.gather(*(self.franchises(*node) for node in level))
+            level = graph.expand(level, results)
+            depth += 1
+        return graph
 
     async def popularity(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        url = ""
-        offset = limit * (page - 1)
-        _filters = await self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-user_count"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-user_count"
-        data = await self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
-    
+        return await self.__execute__(self.__list__(media, Endpoint.POPULARITY, page, filters, limit, fields))
+
     async def top_rate(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        offset = limit * (page - 1)
-        _filters = await self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-averageRating"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-averageRating"
-        data = await self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
+        return await self.__execute__(self.__list__(media, Endpoint.TOP_RATE, page, filters, limit, fields))
 
     async def upcoming(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        offset = limit * (page - 1)
-        _filters = await self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-startDate"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-startDate"
-        data = await self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
+        return await self.__execute__(self.__list__(media, Endpoint.UPCOMING, page, filters, limit, fields))
 
     async def latest(
         self, media: Media,
         page: Optional[int] = 1,
         filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
-        limit: Optional[int] = 10
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
+    ) -> SearchContainer:
+        return await self.__execute__(self.__list__(media, Endpoint.LATEST, page, filters, limit, fields))
+
+    async def search(
+        self, media: Media, query: str,
+        page: Optional[int] = 1,
+        limit: Optional[int] = 10,
+        fields: Optional[List[str]] = None
     ) -> SearchContainer:
-        offset = limit * (page - 1)
-        _filters = await self.__get_filters__(media, filters)
-        if _filters:
-            url = f"{self.url}/{media.value}?{_filters}page[limit]={limit}&page[offset]={offset}&sort=-created_at"
-        else:
-            url = f"{self.url}/{media.value}?page[limit]={limit}&page[offset]={offset}&sort=-created_at"
-        data = await self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
-
-    async def search(self, media: Media, query: str, page: Optional[int] = 1, limit: Optional[int] = 10) -> SearchContainer:
-        offset = limit * (page - 1)
-        url = f"{self.url}/{media.value}?filter[text]={query}&page[limit]={limit}&page[offset]={offset}"
-        data = await self.__fetch__(url)
-        temp = [GeneralResult(d) for d in data["data"]]
-        return SearchContainer(data, temp, page, limit)
+        container = self.__indexed__(media, query, page, limit, fields)
+        if container is not None: return container
+        return await self.__execute__(self.__search__(media, query, page, limit, fields))
+
+    def iter_popularity(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.popularity(media, page, filters, limit, fields), max_results)
+
+    def iter_top_rate(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.top_rate(media, page, filters, limit, fields), max_results)
+
+    def iter_upcoming(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.upcoming(media, page, filters, limit, fields), max_results)
+
+    def iter_latest(
+        self, media: Media,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.latest(media, page, filters, limit, fields), max_results)
+
+    def iter_search(
+        self, media: Media, query: str,
+        limit: Optional[int] = 20,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[GeneralResult]:
+        return self.__iterate__(lambda page: self.search(media, query, page, limit, fields), max_results)
+
+    def scan(
+        self, media: Media,
+        endpoint: Optional[Endpoint] = Endpoint.POPULARITY,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        max_pages: Optional[int] = 25,
+        concurrency: Optional[int] = 8,
+        fields: Optional[List[str]] = None
+    ) -> Scan:
+        return Scan(self, media, endpoint, filters, max_pages, concurrency, fields)
+
+    def images(
+        self, items: Any, cache: ImageCache,
+        size: Optional[str] = "medium",
+        kinds: Optional[Tuple[str, ...]] = ("poster",),
+        concurrency: Optional[int] = 16
+    ) -> ImagePrefetcher:
+        return ImagePrefetcher(self, items, cache, size, kinds, concurrency)
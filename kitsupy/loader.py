@@ -0,0 +1,170 @@
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, List, Set, Tuple, TypeVar
+
+from .enums import Media
+from .exceptions import KitsuException
+from .models import BatchContainer
+
+if TYPE_CHECKING:
+    import asyncio
+
+LoaderT = TypeVar("LoaderT", bound="Loader")
+Key = Tuple[str, int]
+
+KINDS: Dict[str, Callable[[Any, List[int]], Any]] = {
+    "anime": lambda client, ids: client.anime_many(ids),
+    "manga": lambda client, ids: client.manga_many(ids),
+    "animeCharacters": lambda client, ids: client.characters_many(Media.ANIME, ids),
+    "mangaCharacters": lambda client, ids: client.characters_many(Media.MANGA, ids)
+}
+
+def collect(values: Dict[Key, Any], kind: str, ids: List[int], batch: BatchContainer) -> None:
+    missing = set(batch.missing)
+    for id, result in zip([id for id in ids if id not in missing], batch.results): values[(kind, id)] = result
+    for id in missing: values[(kind, id)] = KitsuException.from_status(404, "Record not found", f"{kind} {id}")
+
+class Ref:
+    __slots__ = ("loader", "kind", "id")
+
+    def __init__(self, loader: Any, kind: str, id: int):
+        self.loader = loader
+        self.kind = kind
+        self.id = id
+
+    @property
+    def loaded(self) -> bool:
+        return (self.kind, self.id) in self.loader.values
+
+    def get(self) -> Any:
+        return self.loader.get(self.kind, self.id)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self.loader.wait(self.kind, self.id).__await__()
+
+    def __repr__(self):
+        return f"Ref({self.kind} {self.id}{'' if self.loaded else ', pending'})"
+
+class Loader:
+    def __init__(self, client: Any):
+        self.client = client
+        self.values: Dict[Key, Any] = {}
+        self.pending: Dict[str, Dict[int, None]] = {}
+        self._depth = 0
+        self._lock = RLock()
+
+    def __enter__(self: LoaderT) -> LoaderT:
+        with self._lock: self._depth += 1
+        return self
+
+    def __exit__(self, *excinfo: Any) -> None:
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0 and excinfo[0] is None: self.dispatch()
+
+    def load(self, kind: str, id: int) -> Ref:
+        with self._lock:
+            if (kind, id) not in self.values: self.pending.setdefault(kind, {})[id] = None
+        return Ref(self, kind, id)
+
+    def load_many(self, kind: str, ids: List[int]) -> List[Ref]:
+        return [self.load(kind, id) for id in ids]
+
+    def dispatch(self) -> None:
+        with self._lock:
+            pending, self.pending = self.pending, {}
+            for kind, ids in pending.items():
+                ids = [id for id in ids if (kind, id) not in self.values]
+                if not ids: continue
+                collect(self.values, kind, ids, KINDS[kind](self.client, ids))
+
+    def get(self, kind: str, id: int) -> Any:
+        with self._lock:
+            if (kind, id) not in self.values:
+                self.load(kind, id)
+                self.dispatch()
+            value = self.values[(kind, id)]
+        if isinstance(value, Exception): raise value
+        return value
+
+    async def wait(self, kind: str, id: int) -> Any:
+        return self.get(kind, id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.values = {}
+            self.pending = {}
+
+class AsyncLoader:
+    def __init__(self, client: Any):
+        self.client = client
+        self.values: Dict[Key, Any] = {}
+        self.pending: Dict[str, Dict[int, None]] = {}
+        self.futures: Dict[Key, "asyncio.Future[Any]"] = {}
+        self._tasks: Set["asyncio.Future[None]"] = set()
+        self._scheduled = False
+
+    def load(self, kind: str, id: int) -> Ref:
+        key = (kind, id)
+        if key not in self.values and key not in self.futures:
+            import asyncio
+            loop = asyncio.get_running_loop()
+            self.futures[key] = loop.create_future()
+            self.pending.setdefault(kind, {})[id] = None
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self.dispatch)
+        return Ref(self, kind, id)
+
+    def load_many(self, kind: str, ids: List[int]) -> List[Ref]:
+        return [self.load(kind, id) for id in ids]
+
+    def dispatch(self) -> None:
+        import asyncio
+        self._scheduled = False
+        pending, self.pending = self.pending, {}
+        for kind, ids in pending.items():
+            task = asyncio.ensure_future(self.__load__(kind, list(ids)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def __load__(self, kind: str, ids: List[int]) -> None:
+        try:
+            batch = await KINDS[kind](self.client, ids)
+        except Exception as ex:
+            for id in ids:
+                future = self.futures.pop((kind, id), None)
+                if future is not None and not future.done(): future.set_exception(ex)
+            return
+
+        collect(self.values, kind, ids, batch)
+        for id in ids:
+            future = self.futures.pop((kind, id), None)
+            if future is None or future.done(): continue
+            value = self.values[(kind, id)]
+            if isinstance(value, Exception): future.set_exception(value)
+            else: future.set_result(value)
+
+    def get(self, kind: str, id: int) -> Any:
+        if (kind, id) not in self.values:
+            raise RuntimeError(f"{kind} {id} is not loaded yet, await the reference first")
+        value = self.values[(kind, id)]
+        if isinstance(value, Exception): raise value
+        return value
+
+    async def wait(self, kind: str, id: int) -> Any:
+        import asyncio
+        if (kind, id) in self.values: return self.get(kind, id)
+        self.load(kind, id)
+        return await asyncio.shield(self.futures[(kind, id)])
+
+    def clear(self) -> None:
+        tasks, futures = list(self._tasks), list(self.futures.values())
+        self.values = {}
+        self.pending = {}
+        self.futures = {}
+        self._tasks = set()
+        for task in tasks: task.cancel()
+        for future in futures: future.cancel()
@@ -2,4 +2,5 @@ from .anime import AnimeModel
 from .manga import MangaModel
 from .search import SearchContainer, GeneralResult
 from .character import AnimeCharacter, MangaCharacter
-from .franchises import Franchise
+from .franchises import Franchise, FranchiseGraph
+from .batch import BatchContainer
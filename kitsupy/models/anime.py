@@ -1,43 +1,40 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set, Tuple
+from ..jsonapi import Resolver
 from .base import Model
 
 class AnimeModel(Model):
+    __slots__ = ("episode_count", "episode_length", "youtube_video_id", "producer", "licensors", "studies")
+    PROPERTIES = Model.PROPERTIES + ("episode_count", "episode_length", "youtube_video_id", "producer", "licensors", "studies")
+    INCLUDE = "genres,animeProductions.producer,characters"
+    INCLUDED_FIELDS: Dict[str, str] = {
+        "genres": "name",
+        "animeProductions": "role,producer",
+        "producers": "name",
+        "mediaCharacters": "role"
+    }
+
     def __init__(self, response: Dict[str, Any]):
-        super().__init__(response)
-        data = response.get("data", {})
-        included = response.get("included", [])
-        attributes = data.get("attributes", {})
+        resolver = Resolver(response.get("included", []))
+        super().__init__(response, resolver)
+        attributes = response.get("data", {}).get("attributes", {})
 
         self.episode_count: int = attributes.get("episodeCount", None)
         self.episode_length: int = attributes.get("episodeLength", None)
         self.youtube_video_id: str = attributes.get("youtubeVideoId", None)
-        self.producer: List[str] = self.__get_producers(included)
-        self.licensors: List[str] = self.__get_licensors(included)
-        self.studies: List[str] = self.__get_studies(included)
 
-    def __get_producers(self, included) -> List[str]:
-        return [
-            p["attributes"]["name"] for p in included
-            if p["type"] == "producers" and p["id"] in [
-                ap["relationships"]["producer"]["data"]["id"] for ap in included
-                if ap["type"] == "animeProductions" and ap["attributes"]["role"] == "producer"
-            ]
-        ]
+        productions = self.__get_productions(resolver)
+        self.producer: List[str] = productions["producer"]
+        self.licensors: List[str] = productions["licensor"]
+        self.studies: List[str] = productions["studio"]
 
-    def __get_licensors(self, included) -> List[str]:
-        return [
-            l["attributes"]["name"] for l in included
-            if l["type"] == "producers" and l["id"] in [
-                ap["relationships"]["producer"]["data"]["id"] for ap in included
-                if ap["type"] == "animeProductions" and ap["attributes"]["role"] == "licensor"
-            ]
-        ]
+    def __get_productions(self, resolver: Resolver) -> Dict[str, List[str]]:
+        roles: Dict[Tuple[str, str], Set[str]] = {}
+        for production in resolver.of_type("animeProductions"):
+            for producer in resolver.related(production, "producer"):
+                roles.setdefault((producer["type"], producer["id"]), set()).add(production["attributes"]["role"])
 
-    def __get_studies(self, included) -> List[str]:
-        return [
-            s["attributes"]["name"] for s in included
-            if s["type"] == "producers" and s["id"] in [
-                ap["relationships"]["producer"]["data"]["id"] for ap in included
-                if ap["type"] == "animeProductions" and ap["attributes"]["role"] == "studio"
-            ]
-        ]
+        productions: Dict[str, List[str]] = {"producer": [], "licensor": [], "studio": []}
+        for producer in resolver.of_type("producers"):
+            for role in roles.get((producer["type"], producer["id"]), ()):
+                if role in productions: productions[role].append(producer["attributes"]["name"])
+        return productions
@@ -1,19 +1,75 @@
-import json
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .. import codec
 from ..enums import Genres
+from ..jsonapi import Resolver
+
+GENRE_NAMES: Dict[int, str] = {genre.value: genre.name.replace("_", " ").lower().title() for genre in Genres}
+
+class lazy:
+    def __init__(self, decode: Callable[[str], Any]):
+        self.decode = decode
+        self.slot = None
+
+    def __set_name__(self, owner: type, name: str):
+        self.slot = owner.__dict__[f"_{name}"]
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None: return self
+        value = self.slot.__get__(instance, owner)
+        if isinstance(value, str):
+            value = self.decode(value)
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance: Any, value: Any):
+        self.slot.__set__(instance, value)
+
+def convert_to(value, t):
+    try:
+        return t(value)
+    except Exception:
+        return None
+
+def parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def get_dates(attributes: dict, key: str) -> datetime:
+    _date = attributes.get(key, None)
+    if _date: return parse_date(_date)
+    return None
+
+def get_images(attributes: dict, key: str) -> Dict[str, str]:
+    images = attributes.get(key, None)
+    if images: return {size:value for (size, value) in images.items() if size != "meta"}
+    return None
 
 class Model:
-    def __init__(self, response: Dict[str, Dict[str, Any]]):
+    __slots__ = (
+        "id", "type", "_created_at", "_updated_at", "slug", "synopsis", "description", "cover_image_top_off_set",
+        "titles", "canonical_title", "abbreviated_titles", "average_rating", "rating_frequencies", "user_count",
+        "favorites_count", "_start_date", "_end_date", "next_release", "popularity_rank", "rating_rank",
+        "age_rating", "age_rating_guide", "subtype", "status", "tba", "poster_images", "cover_images", "genres",
+        "main_characters", "supporting_characters", "_loader"
+    )
+    PROPERTIES: Tuple[str, ...] = (
+        "id", "type", "created_at", "updated_at", "slug", "synopsis", "description", "cover_image_top_off_set",
+        "titles", "canonical_title", "abbreviated_titles", "average_rating", "rating_frequencies", "user_count",
+        "favorites_count", "start_date", "end_date", "next_release", "popularity_rank", "rating_rank",
+        "age_rating", "age_rating_guide", "subtype", "status", "tba", "poster_images", "cover_images", "genres",
+        "main_characters", "supporting_characters"
+    )
+
+    def __init__(self, response: Dict[str, Dict[str, Any]], resolver: Optional[Resolver] = None):
         data = response.get("data", {})
-        included = response.get("included", [])
+        if resolver is None: resolver = Resolver(response.get("included", []))
         attributes = data.get("attributes", {})
-        relationship = data.get("relationships", {})
+        relationships = data.get("relationships", {})
 
-        self.id: int = self.__convert_to(data.get("id", None), int)
+        self.id: int = convert_to(data.get("id", None), int)
         self.type: str = data.get("type", None)
-        self.created_at = self.__get_dates(attributes, "createdAt")
-        self.updated_at = self.__get_dates(attributes, "updatedAt")
+        self._created_at = attributes.get("createdAt", None) or None
+        self._updated_at = attributes.get("updatedAt", None) or None
         self.slug: str = attributes.get("slug", None)
         self.synopsis: str = attributes.get("synopsis", None)
         self.description: str = attributes.get("description", None)
@@ -21,12 +77,12 @@ class Model:
         self.titles: Dict[str, str] = attributes.get("titles", None)
         self.canonical_title: str = attributes.get("canonicalTitle", None)
         self.abbreviated_titles: List[str] = attributes.get("abbreviatedTitles", None)
-        self.average_rating: float = self.__convert_to(attributes.get("averageRating", None), float)
+        self.average_rating: float = convert_to(attributes.get("averageRating", None), float)
         self.rating_frequencies: Dict[str, str] = attributes.get("ratingFrequencies", None)
         self.user_count: int = attributes.get("userCount", None)
         self.favorites_count: int = attributes.get("favoritesCount", None)
-        self.start_date = self.__get_dates(attributes, "startDate")
-        self.end_date = self.__get_dates(attributes, "endDate")
+        self._start_date = attributes.get("startDate", None) or None
+        self._end_date = attributes.get("endDate", None) or None
         self.next_release = attributes.get("nextRelease", None)
         self.popularity_rank: int = attributes.get("popularityRank", None)
         self.rating_rank: int = attributes.get("ratingRank", None)
@@ -35,55 +91,67 @@ class Model:
         self.subtype: str = attributes.get("subtype", None)
         self.status: str = attributes.get("status", None)
         self.tba = attributes.get("tba", None)
-        self.poster_images: Dict[str, str] = self.__get_images(attributes, "posterImage")
-        self.cover_images: Dict[str, str] = self.__get_images(attributes, "coverImage")
-        self.genres: List[str] = self.__get_genres(relationship)
-        self.main_characters: List[int] = self.__get_main_characters(included)
-        self.supporting_characters: List[int] = self.__get_supporting_characters(included)
-
-    def __convert_to(self, value, t):
-        try:
-            return t(value)
-        except Exception:
-            return None
-
-    def __get_dates(self, attributes: dict, key: str) -> datetime:
-        _date = attributes.get(key, None)
-        if _date: return datetime.fromisoformat(_date.replace("Z", "+00:00"))
-        return None
-    
-    def __get_images(self, attributes: dict, key: str) -> Dict[str, str]:
-        images = attributes.get(key, None)
-        if images: return {size:value for (size, value) in images.items() if size != "meta"}
-        return None
+        self.poster_images: Dict[str, str] = get_images(attributes, "posterImage")
+        self.cover_images: Dict[str, str] = get_images(attributes, "coverImage")
+        self.genres: List[str] = self.__get_genres(relationships)
+        characters = self.__get_characters(resolver)
+        self.main_characters: List[int] = characters["main"]
+        self.supporting_characters: List[int] = characters["supporting"]
+        self._loader = None
+
+    created_at: datetime = lazy(parse_date)
+    updated_at: datetime = lazy(parse_date)
+    start_date: datetime = lazy(parse_date)
+    end_date: datetime = lazy(parse_date)
+
+    @property
+    def main_cast(self) -> List[Any]:
+        return self.__refs__(self.main_characters)
+
+    @property
+    def supporting_cast(self) -> List[Any]:
+        return self.__refs__(self.supporting_characters)
+
+    def __refs__(self, ids: List[int]) -> List[Any]:
+        if self._loader is None:
+            raise RuntimeError("The model is not bound to a client")
+        return self._loader.load_many(f"{self.type}Characters", ids)
 
     def __get_genres(self, relationship: dict) -> List[str]:
-        return [
-            genre.name.replace("_", " ").lower().title() for genre in Genres
-            if genre.value in [
-                int(d["id"]) for d in relationship["genres"]["data"]
-            ]
-        ]
-
-    def __get_main_characters(self, included) -> List[int]:
-        return [
-            int(d["id"]) for d in included
-            if d["type"] == "mediaCharacters"
-            and d["attributes"]["role"] == "main"
-        ]
-    
-    def __get_supporting_characters(self, included) -> List[int]:
-        return [
-            int(d["id"]) for d in included
-            if d["type"] == "mediaCharacters"
-            and d["attributes"]["role"] == "supporting"
-        ]
-    
+        ids = {int(d["id"]) for d in relationship["genres"]["data"]}
+        return [name for value, name in GENRE_NAMES.items() if value in ids]
+
+    def __get_characters(self, resolver: Resolver) -> Dict[str, List[int]]:
+        characters: Dict[str, List[int]] = {"main": [], "supporting": []}
+        for character in resolver.of_type("mediaCharacters"):
+            role = character["attributes"]["role"]
+            if role in characters: characters[role].append(int(character["id"]))
+        return characters
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.PROPERTIES}
+
     def to_json(self, indent: Optional[int] = 2):
-        return json.dumps(self.__dict__, indent=indent, ensure_ascii=False, default=str)
+        return codec.dumps(self.to_dict(), indent)
 
 
 class General:
+    __slots__ = (
+        "id", "type", "titles", "canonical_title", "average_rating", "popularity_rank",
+        "rating_rank", "subtype", "status", "poster_images", "cover_images"
+    )
+    FIELDS: Dict[str, str] = {
+        "titles": "titles",
+        "canonical_title": "canonicalTitle",
+        "average_rating": "averageRating",
+        "popularity_rank": "popularityRank",
+        "rating_rank": "ratingRank",
+        "subtype": "subtype",
+        "status": "status",
+        "poster_images": "posterImage",
+        "cover_images": "coverImage"
+    }
+
     def __init__(self, response: Dict[str, Any]):
         data = response
         attributes = response.get("attributes", {})
@@ -92,24 +160,16 @@ class General:
         self.type: str = data.get("type", None)
         self.titles: Dict[str, str] = attributes.get("titles", None)
         self.canonical_title: str = attributes.get("canonicalTitle", None)
-        self.average_rating: float = self.__convert_to(attributes.get("averageRating", None), float)
+        self.average_rating: float = convert_to(attributes.get("averageRating", None), float)
         self.popularity_rank: int = attributes.get("popularityRank", None)
         self.rating_rank: int = attributes.get("ratingRank", None)
         self.subtype: str = attributes.get("subtype", None)
         self.status: str = attributes.get("status", None)
-        self.poster_images: Dict[str, str] = self.__get_images(attributes, "posterImage")
-        self.cover_images: Dict[str, str] = self.__get_images(attributes, "coverImage")
-
-    def __convert_to(self, value, t):
-        try:
-            return t(value)
-        except Exception:
-            return None
-
-    def __get_images(self, attributes: dict, key: str) -> Dict[str, str]:
-        images = attributes.get(key, None)
-        if images: return {size:value for (size, value) in images.items() if size != "meta"}
-        return None
+        self.poster_images: Dict[str, str] = get_images(attributes, "posterImage")
+        self.cover_images: Dict[str, str] = get_images(attributes, "coverImage")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in General.__slots__}
 
     def to_json(self, indent: Optional[int] = 2):
-        return json.dumps(self.__dict__, indent=indent, ensure_ascii=False, default=str)
+        return codec.dumps(self.to_dict(), indent)
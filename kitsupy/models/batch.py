@@ -0,0 +1,18 @@
+from typing import Any, Dict, List, Optional, Union
+from .. import codec
+from .anime import AnimeModel
+from .manga import MangaModel
+
+class BatchContainer:
+    __slots__ = ("results", "missing", "total_result")
+
+    def __init__(self, elements: List[Union[AnimeModel, MangaModel]], missing: List[int]):
+        self.results = elements
+        self.missing = missing
+        self.total_result = len(elements)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in BatchContainer.__slots__}
+
+    def to_json(self, indent: Optional[int] = 2):
+        return codec.dumps(self.to_dict(), indent)
@@ -1,12 +1,23 @@
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
+from .. import codec
+from ..jsonapi import Resolver
+from .base import convert_to
 
 class Character:
+    __slots__ = (
+        "id", "slug", "names", "canonical_name", "other_names",
+        "name", "mal_id", "description", "image"
+    )
+    PROPERTIES: Tuple[str, ...] = (
+        "id", "slug", "names", "canonical_name", "other_names", "name", "mal_id", "description", "image"
+    )
+
     def __init__(self, response: Dict[str, Any]):
         data = response.get("data", {})
+
         attributes = data.get("attributes", {})
 
-        self.id: int = self.__convert_to(data.get("id", None), int)
+        self.id: int = convert_to(data.get("id", None), int)
         self.slug: str = attributes.get("slug", None)
         self.names: List[str] = attributes.get("names", None)
         self.canonical_name: str = attributes.get("canonicalName", None)
@@ -14,38 +25,50 @@ class Character:
         self.name: str = attributes.get("name", None)
         self.mal_id: int = attributes.get("malId", None)
         self.description: str = attributes.get("description", None)
-        self.image: str = attributes["image"]["original"] if attributes["image"] else None
-
-    def __convert_to(self, value, t):
-        try:
-            return t(value)
-        except Exception:
-            return None
-    
+        self.image: str = attributes["image"]["original"] if attributes.get("image", None) else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.PROPERTIES}
+
     def to_json(self, indent: Optional[int] = 2):
-        return json.dumps(self.__dict__, indent=indent, ensure_ascii=False, default=str)
+        return codec.dumps(self.to_dict(), indent)
 
 
 class AnimeCharacter(Character):
+    __slots__ = ("voice_actor",)
+    PROPERTIES = Character.PROPERTIES + ("voice_actor",)
+
     def __init__(self, response: Dict[str, Any]):
         super().__init__(response)
-        included = response.get("included", [])
+        resolver = Resolver(response.get("included", []))
 
-        self.voice_actor: Dict[str, Dict[str, str]] = self.__get_voice_actor(included)
+        self.voice_actor: Dict[str, Dict[str, str]] = self.__get_voice_actor(resolver)
 
-    def __get_voice_actor(self, included) -> Dict[str, Dict[str, str]]:
-        temp = []
-        locales = [locale["attributes"]["locale"] for locale in included if locale["type"] == "characterVoices"]
-        for person in included:
-            if person["type"] == "people":
-                temp.append({
-                        "name": person["attributes"]["name"],
-                        "decription": person["attributes"]["description"],
-                        "image": person["attributes"]["image"]["original"] if person["attributes"]["image"] else None
-                    })
-
-        return {key:value for key, value in zip(locales, temp)}
+    def __get_voice_actor(self, resolver: Resolver) -> Dict[str, Dict[str, str]]:
+        voice_actor = {}
+        for voice in resolver.of_type("characterVoices"):
+            for person in resolver.related(voice, "person"):
+                voice_actor[voice["attributes"]["locale"]] = {
+                    "name": person["attributes"]["name"],
+                    "decription": person["attributes"]["description"],
+                    "image": person["attributes"]["image"]["original"] if person["attributes"]["image"] else None
+                }
+        return voice_actor
 
 class MangaCharacter(Character):
+    __slots__ = ()
+
     def __init__(self, data: Dict[str, Any]):
         super().__init__(data)
+
+def character_documents(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    resolver = Resolver(document.get("included", None) or [])
+    documents = {}
+    for media_character in document.get("data", None) or []:
+        for character in resolver.related(media_character, "character"):
+            included = [resource for resource in resolver.reachable(media_character) if resource is not character]
+            documents[media_character["id"]] = {"data": character, "included": included}
+    return documents
+
+def cast_of(model: Type[Character], document: Dict[str, Any]) -> Tuple[Character, ...]:
+    return tuple(model(data) for data in character_documents(document).values())
@@ -1,8 +1,77 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+from .. import codec
+from ..enums import Media
+from ..jsonapi import Resolver
 from .base import General
 
+Node = Tuple[str, int]
+
 class Franchise(General):
+    __slots__ = ("role", "_loader")
+
     def __init__(self, root: Dict[str, Any], data: Dict[str, Any]):
         super().__init__(data)
         self.role = root["attributes"]["role"]
-    
\ No newline at end of file
+        self._loader = None
+
+    @property
+    def detail(self) -> Any:
+        if self._loader is None:
+            raise RuntimeError("The model is not bound to a client")
+        return self._loader.load(self.type, self.id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**super().to_dict(), "role": self.role}
+
+def franchises_of(document: Dict[str, Any]) -> Tuple[Franchise, ...]:
+    resolver = Resolver(document.get("included", None) or [])
+    return tuple(
+        Franchise(relationship, destination)
+        for relationship in document.get("data", None) or []
+        for destination in resolver.related(relationship, "destination")
+    )
+
+class FranchiseGraph:
+    __slots__ = ("root", "nodes", "edges", "depths")
+
+    def __init__(self, media: Media, id: int):
+        self.root: Node = (media.value, id)
+        self.nodes: Dict[Node, Franchise] = {}
+        self.edges: Dict[Node, List[Tuple[str, Node]]] = {self.root: []}
+        self.depths: Dict[Node, int] = {self.root: 0}
+
+    def expand(self, level: List[Tuple[Media, int]], results: List[Tuple[Franchise, ...]]) -> List[Tuple[Media, int]]:
+        following = []
+        for (media, id), franchises in zip(level, results):
+            source = (media.value, id)
+            depth = self.depths[source] + 1
+            for franchise in franchises:
+                node = (franchise.type, franchise.id)
+                self.edges[source].append((franchise.role, node))
+                if node in self.depths: continue
+                self.nodes[node] = franchise
+                self.edges[node] = []
+                self.depths[node] = depth
+                following.append((Media(franchise.type), franchise.id))
+        return following
+
+    def __len__(self) -> int:
+        return len(self.depths)
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self.depths
+
+    def to_dict(self) -> Dict[str, Any]:
+        key = lambda node: f"{node[0]}:{node[1]}"
+        return {
+            "root": key(self.root),
+            "nodes": {key(node): General.to_dict(franchise) for node, franchise in self.nodes.items()},
+            "edges": {
+                key(source): [{"role": role, "node": key(node)} for role, node in targets]
+                for source, targets in self.edges.items()
+            },
+            "depths": {key(node): depth for node, depth in self.depths.items()}
+        }
+
+    def to_json(self, indent: Optional[int] = 2):
+        return codec.dumps(self.to_dict(), indent)
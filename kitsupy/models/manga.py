@@ -2,10 +2,17 @@ from typing import Any, Dict
 from .base import Model
 
 class MangaModel(Model):
+    __slots__ = ("chapter_count", "volume_count", "serialization")
+    PROPERTIES = Model.PROPERTIES + ("chapter_count", "volume_count", "serialization")
+    INCLUDE = "genres,characters"
+    INCLUDED_FIELDS: Dict[str, str] = {
+        "genres": "name",
+        "mediaCharacters": "role"
+    }
+
     def __init__(self, response: Dict[str, Dict[str, Any]]):
         super().__init__(response)
-        data = response.get("data", {})
-        attributes = data.get("attributes", {})
+        attributes = response.get("data", {}).get("attributes", {})
 
         self.chapter_count: int = attributes.get("chapterCount", None)
         self.volume_count: int = attributes.get("volumeCount", None)
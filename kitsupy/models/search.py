@@ -1,18 +1,32 @@
 import math
-import json
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from .. import codec
 from .base import General
 
+if TYPE_CHECKING:
+    from ..frame import ResultFrame
+
 class GeneralResult(General):
+    __slots__ = ()
+
     def __init__(self, data: Dict[str, Any]):
         super().__init__(data)
 
 class SearchContainer:
+    __slots__ = ("page", "results", "total_page", "total_result")
+
     def __init__(self, data: Dict[str, Any], elements: List[GeneralResult], page: int, limit: int):
         self.page = page
         self.results = elements
         self.total_page = math.ceil(data["meta"]["count"] / limit)
         self.total_result = data["meta"]["count"]
-    
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in SearchContainer.__slots__}
+
+    def to_frame(self) -> "ResultFrame":
+        from ..frame import ResultFrame
+        return ResultFrame.from_results(self.results)
+
     def to_json(self, indent: Optional[int] = 2):
-        return json.dumps(self.__dict__, indent=indent, ensure_ascii=False, default=str)
+        return codec.dumps(self.to_dict(), indent)
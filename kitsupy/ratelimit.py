@@ -0,0 +1,128 @@
+import random
+import time
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+RETRY_STATUSES: Tuple[int, ...] = (429, 502, 503, 504)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value: return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+class RetryPolicy:
+    def __init__(
+        self,
+        retries: Optional[int] = 3,
+        backoff: Optional[float] = 0.5,
+        max_backoff: Optional[float] = 30.0,
+        statuses: Optional[Tuple[int, ...]] = RETRY_STATUSES
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None: return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+class RateLimiter:
+    _shared: Optional["RateLimiter"] = None
+
+    def __init__(
+        self,
+        rate: Optional[float] = 10.0,
+        burst: Optional[int] = None,
+        min_rate: Optional[float] = 0.5,
+        max_rate: Optional[float] = None,
+        increase: Optional[float] = 0.1,
+        decrease: Optional[float] = 0.5
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.decrease = decrease
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = Lock()
+
+    @classmethod
+    def shared(cls) -> "RateLimiter":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __reserve__(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> float:
+        wait = self.__reserve__()
+        if wait > 0: time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        import asyncio
+        wait = self.__reserve__()
+        if wait > 0: await asyncio.sleep(wait)
+        return wait
+
+    def success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def backoff(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+def shared_field(index: int) -> property:
+    return property(
+        lambda self: self._state[index],
+        lambda self, value: self._state.__setitem__(index, value)
+    )
+
+class SharedRateLimiter(RateLimiter):
+    rate = shared_field(0)
+    _tokens = shared_field(1)
+    _updated = shared_field(2)
+    _blocked_until = shared_field(3)
+
+    def __init__(
+        self,
+        rate: Optional[float] = 10.0,
+        burst: Optional[int] = None,
+        min_rate: Optional[float] = 0.5,
+        max_rate: Optional[float] = None,
+        increase: Optional[float] = 0.1,
+        decrease: Optional[float] = 0.5,
+        context: Optional[Any] = None
+    ):
+        if context is None:
+            import multiprocessing
+            context = multiprocessing.get_context()
+        self._state = context.RawArray("d", 4)
+        super().__init__(rate, burst, min_rate, max_rate, increase, decrease)
+        self._lock = context.Lock()
@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+from .core import SORTS, KitsuCore
+from .enums import *
+from .jsonapi import MAX_PAGE_LIMIT
+from .models import GeneralResult
+
+YEARS: Tuple[int, int] = (1868, 2030)
+
+class Slice:
+    __slots__ = ("filters", "count", "children")
+
+    def __init__(self, filters: Dict[Filter, List[Union[Enum, int]]]):
+        self.filters = filters
+        self.count: Optional[int] = None
+        self.children: List["Slice"] = []
+
+    def __repr__(self):
+        filters = ", ".join(
+            f"{key.value}={'..'.join(str(value.value if isinstance(value, Enum) else value) for value in values)}"
+            for key, values in self.filters.items()
+        )
+        return f"Slice({filters or 'all'}: {self.count})"
+
+class Scan:
+    def __init__(
+        self,
+        client: KitsuCore,
+        media: Media,
+        endpoint: Optional[Endpoint] = Endpoint.POPULARITY,
+        filters: Optional[Dict[Filter, List[Union[Enum, int]]]] = {},
+        max_pages: Optional[int] = 25,
+        concurrency: Optional[int] = 8,
+        fields: Optional[List[str]] = None
+    ):
+        if max_pages <= 0 or concurrency <= 0:
+            raise ValueError("max_pages and concurrency must be greater than 0")
+
+        self.client = client
+        self.media = media
+        self.endpoint = endpoint
+        self.sort = SORTS[endpoint]
+        self.filters = dict(filters)
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.fields = fields
+        self.root = Slice(self.filters)
+        self.slices: List[Slice] = []
+        self.requests = 0
+        self.count = 0
+
+    @property
+    def total(self) -> Optional[int]:
+        return self.root.count
+
+    @property
+    def unreachable(self) -> int:
+        missed, stack = 0, [self.root]
+        while stack:
+            slice = stack.pop()
+            if slice.children and all(child.count is not None for child in slice.children):
+                missed += max(0, slice.count - sum(child.count for child in slice.children))
+            stack.extend(slice.children)
+        return missed
+
+    def __split__(self, slice: Slice) -> List[Dict[Filter, List[Union[Enum, int]]]]:
+        filters = slice.filters
+        years = filters.get(Filter.YEAR, None)
+        start, end = (years[0], years[-1] if len(years) > 1 else YEARS[1]) if years else YEARS
+        if not years or end > start:
+            middle = (start + end) // 2
+            return [{**filters, Filter.YEAR: [start, middle]}, {**filters, Filter.YEAR: [middle + 1, end]}]
+
+        subtypes = filters.get(Filter.SUBTYPE, None) or list(AnimeSubtype if self.media == Media.ANIME else MangaSubtype)
+        if len(subtypes) > 1: return [{**filters, Filter.SUBTYPE: [subtype]} for subtype in subtypes]
+
+        seasons = filters.get(Filter.SEASON, None) or list(Season)
+        if self.media == Media.ANIME and len(seasons) > 1: return [{**filters, Filter.SEASON: [season]} for season in seasons]
+        return []
+
+    async def __page__(self, slice: Slice, page: int) -> Dict[str, Any]:
+        self.requests += 1
+        url = self.client.__list_url__(self.media, self.sort, page, slice.filters, MAX_PAGE_LIMIT, self.fields)
+        return await self.client.__fetch__(url, self.endpoint)
+
+    def __plan__(self, slice: Slice, data: Dict[str, Any], jobs: Deque[Tuple[Slice, int]]) -> None:
+        slice.count = data["meta"]["count"]
+        pages = -(-slice.count // MAX_PAGE_LIMIT)
+        if pages > self.max_pages:
+            slice.children = [Slice(filters) for filters in self.__split__(slice)]
+            jobs.extendleft((child, 1) for child in reversed(slice.children))
+            if slice.children: return
+
+        self.slices.append(slice)
+        jobs.extend((slice, page) for page in range(2, pages + 1))
+
+    def __aiter__(self) -> AsyncIterator[GeneralResult]:
+        return self.__scan__()
+
+    async def __scan__(self) -> AsyncIterator[GeneralResult]:
+        jobs: Deque[Tuple[Slice, int]] = deque([(self.root, 1)])
+        running: Dict["asyncio.Future[Dict[str, Any]]", Tuple[Slice, int]] = {}
+        seen = set()
+        try:
+            while jobs or running:
+                while jobs and len(running) < self.concurrency:
+                    slice, page = jobs.popleft()
+                    running[asyncio.ensure_future(self.__page__(slice, page))] = (slice, page)
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    slice, page = running.pop(task)
+                    data = task.result()
+                    if page == 1: self.__plan__(slice, data, jobs)
+
+                    for resource in data["data"]:
+                        if resource["id"] in seen: continue
+                        seen.add(resource["id"])
+                        self.count += 1
+                        yield GeneralResult(resource)
+        finally:
+            for task in running: task.cancel()
+            if running: await asyncio.gather(*running, return_exceptions=True)
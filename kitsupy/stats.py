@@ -0,0 +1,232 @@
+from bisect import bisect_left
+from collections import Counter
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .enums import Endpoint
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PARSE_BUCKETS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Optional[Tuple[float, ...]] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max: self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        if not self.count: return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count, "mean": self.mean, "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9), "p99": self.quantile(0.99), "max": self.max
+        }
+
+class EndpointStats:
+    __slots__ = ("latency", "ttfb", "decode", "build", "requests", "bytes", "statuses", "retries", "errors", "hits")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.ttfb = Histogram(LATENCY_BUCKETS)
+        self.decode = Histogram(PARSE_BUCKETS)
+        self.build = Histogram(PARSE_BUCKETS)
+        self.requests = 0
+        self.bytes = 0
+        self.statuses: Counter = Counter()
+        self.retries = 0
+        self.errors = 0
+        self.hits: Counter = Counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "statuses": dict(self.statuses),
+            "retries": self.retries,
+            "errors": self.errors,
+            "hits": dict(self.hits),
+            "latency": self.latency.to_dict(),
+            "ttfb": self.ttfb.to_dict(),
+            "decode": self.decode.to_dict(),
+            "build": self.build.to_dict()
+        }
+
+class Stats:
+    def __init__(self):
+        self._lock = Lock()
+        self.endpoints: Dict[Endpoint, EndpointStats] = {}
+        self.throttled = 0
+        self.throttle_time = 0.0
+
+    def __endpoint__(self, endpoint: Optional[Endpoint]) -> EndpointStats:
+        stats = self.endpoints.get(endpoint, None)
+        if stats is None: stats = self.endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        with self._lock:
+            if event == "throttle":
+                self.throttled += 1
+                self.throttle_time += info["wait"]
+                return
+
+            stats = self.__endpoint__(info.get("endpoint", None))
+            if event == "response":
+                stats.requests += 1
+                stats.bytes += info["bytes"]
+                stats.statuses[info["status"]] += 1
+                stats.latency.observe(info["elapsed"])
+                stats.ttfb.observe(info["ttfb"])
+                stats.decode.observe(info["decode"])
+            elif event == "build": stats.build.observe(info["elapsed"])
+            elif event == "hit": stats.hits[info["source"]] += 1
+            elif event == "retry": stats.retries += 1
+            elif event == "error": stats.errors += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints = {}
+            self.throttled = 0
+            self.throttle_time = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "endpoints": {
+                    (endpoint.value if endpoint is not None else "other"): stats.to_dict()
+                    for endpoint, stats in self.endpoints.items()
+                },
+                "throttled": self.throttled,
+                "throttle_time": self.throttle_time
+            }
+
+    def to_prometheus(self, prefix: Optional[str] = "kitsupy") -> str:
+        lines: List[str] = []
+
+        def metric(name: str, type: str, help: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {type}")
+            return f"{prefix}_{name}"
+
+        def histogram(name: str, help: str, select: Callable[[EndpointStats], Histogram]) -> None:
+            name = metric(name, "histogram", help)
+            for label, stats in endpoints:
+                values = select(stats)
+                cumulative = 0
+                for bound, count in zip(values.buckets, values.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{endpoint="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{endpoint="{label}",le="+Inf"}} {values.count}')
+                lines.append(f'{name}_sum{{endpoint="{label}"}} {values.sum}')
+                lines.append(f'{name}_count{{endpoint="{label}"}} {values.count}')
+
+        def counter(name: str, help: str, select: Callable[[EndpointStats], int]) -> None:
+            name = metric(name, "counter", help)
+            for label, stats in endpoints:
+                lines.append(f'{name}{{endpoint="{label}"}} {select(stats)}')
+
+        with self._lock:
+            endpoints = [
+                (endpoint.value if endpoint is not None else "other", stats)
+                for endpoint, stats in self.endpoints.items()
+            ]
+            histogram("request_duration_seconds", "Time from sending the request to reading the whole body.", lambda s: s.latency)
+            histogram("time_to_first_byte_seconds", "Time from sending the request to receiving the response headers.", lambda s: s.ttfb)
+            histogram("decode_duration_seconds", "Time spent decoding the JSON body.", lambda s: s.decode)
+            histogram("build_duration_seconds", "Time spent building models from a document.", lambda s: s.build)
+            counter("response_bytes_total", "Response body bytes received.", lambda s: s.bytes)
+            counter("retries_total", "Requests retried after a retryable status or connection error.", lambda s: s.retries)
+            counter("errors_total", "Requests that failed after the last retry.", lambda s: s.errors)
+
+            name = metric("responses_total", "counter", "Responses received by HTTP status.")
+            for label, stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'{name}{{endpoint="{label}",status="{status}"}} {count}')
+            name = metric("hits_total", "counter", "Requests served from the response cache or the store.")
+            for label, stats in endpoints:
+                for source, count in sorted(stats.hits.items()):
+                    lines.append(f'{name}{{endpoint="{label}",source="{source}"}} {count}')
+
+            name = metric("throttle_seconds_total", "counter", "Time spent waiting for the rate limiter.")
+            lines.append(f"{name} {self.throttle_time}")
+        return "\n".join(lines) + "\n"
+
+class SpanAdapter:
+    def __init__(self, tracer: Any = None, name: Optional[str] = "kitsu"):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                raise ImportError("SpanAdapter requires a tracer or the 'opentelemetry-api' package") from None
+            tracer = trace.get_tracer("kitsupy")
+        self.tracer = tracer
+        self.name = name
+
+    def __call__(self, event: str, info: Dict[str, Any]) -> None:
+        if event not in ("response", "error"): return
+        if event == "error" and info.get("status", None) is not None: return
+
+        endpoint = info.get("endpoint", None)
+        attributes = {
+            "http.method": "GET",
+            "http.url": info["url"],
+            "kitsu.endpoint": endpoint.value if endpoint is not None else "other",
+            "kitsu.attempts": info.get("attempt", 0) + 1
+        }
+        if event == "response":
+            attributes.update({
+                "http.status_code": info["status"],
+                "http.response_content_length": info["bytes"],
+                "kitsu.ttfb_ms": info["ttfb"] * 1e3,
+                "kitsu.decode_ms": info["decode"] * 1e3
+            })
+        else:
+            attributes["error.type"] = type(info["error"]).__name__
+
+        span = self.tracer.start_span(
+            f"{self.name} {attributes['kitsu.endpoint']}",
+            start_time=int(info["started_at"] * 1e9),
+            attributes=attributes
+        )
+        if event == "error" or info["status"] >= 400:
+            self.__set_error__(span, info.get("error", None))
+        span.end(end_time=int((info["started_at"] + info["elapsed"]) * 1e9))
+
+    def __set_error__(self, span: Any, error: Optional[BaseException]) -> None:
+        try:
+            from opentelemetry.trace import Status, StatusCode
+        except ImportError:
+            return
+        if error is not None: span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR))
+
+def chain(*hooks: Optional[Callable[[str, Dict[str, Any]], None]]) -> Callable[[str, Dict[str, Any]], None]:
+    hooks = tuple(hook for hook in hooks if hook is not None)
+
+    def call(event: str, info: Dict[str, Any]) -> None:
+        for hook in hooks: hook(event, info)
+    return call
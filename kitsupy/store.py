@@ -0,0 +1,98 @@
+import os
+import sqlite3
+from threading import local
+from time import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from . import codec
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    updated_at TEXT,
+    fetched_at REAL NOT NULL,
+    document BLOB NOT NULL,
+    PRIMARY KEY (type, id)
+) WITHOUT ROWID
+"""
+
+UPSERT = """
+INSERT INTO resources (type, id, updated_at, fetched_at, document) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (type, id) DO UPDATE SET
+    updated_at = excluded.updated_at,
+    fetched_at = excluded.fetched_at,
+    document = excluded.document
+WHERE resources.updated_at IS NULL
+    OR excluded.updated_at IS NULL
+    OR excluded.updated_at >= resources.updated_at
+"""
+
+class SQLiteStore:
+    def __init__(self, path: str, max_age: Optional[float] = 24 * 60 * 60, timeout: Optional[float] = 30.0):
+        self.path = path
+        self.max_age = max_age
+        self.timeout = timeout
+        self._local = local()
+        self.__connection__()
+
+    def __connection__(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(SCHEMA)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def __updated_at__(self, document: Dict[str, Any]) -> Optional[str]:
+        data = document.get("data", None)
+        if isinstance(data, dict):
+            return data.get("attributes", {}).get("updatedAt", None)
+        return None
+
+    def get(self, type: str, id: Union[int, str], updated_at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        row = self.__connection__().execute(
+            "SELECT updated_at, fetched_at, document FROM resources WHERE type = ? AND id = ?",
+            (type, str(id))
+        ).fetchone()
+        if row is None: return None
+
+        stored_updated_at, fetched_at, document = row
+        if self.max_age is not None and time() - fetched_at > self.max_age: return None
+        if updated_at is not None and (stored_updated_at is None or stored_updated_at < updated_at): return None
+        return codec.loads(document)
+
+    def put(self, type: str, id: Union[int, str], document: Dict[str, Any]) -> None:
+        self.__connection__().execute(UPSERT, (
+            type, str(id), self.__updated_at__(document), time(),
+            codec.encode(document)
+        ))
+
+    def documents(self, type: str) -> Iterator[Dict[str, Any]]:
+        rows = self.__connection__().execute("SELECT document FROM resources WHERE type = ?", (type,))
+        for (document,) in rows: yield codec.loads(document)
+
+    def is_stale(self, type: str, id: Union[int, str], updated_at: str) -> bool:
+        row = self.__connection__().execute(
+            "SELECT updated_at FROM resources WHERE type = ? AND id = ?", (type, str(id))
+        ).fetchone()
+        return row is None or row[0] is None or row[0] < updated_at
+
+    def delete(self, type: str, ids: Iterable[Union[int, str]]) -> None:
+        self.__connection__().executemany(
+            "DELETE FROM resources WHERE type = ? AND id = ?", ((type, str(id)) for id in ids)
+        )
+
+    def __len__(self) -> int:
+        return self.__connection__().execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,123 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+from . import codec
+from .enums import Endpoint, Media
+from .jsonapi import MAX_PAGE_LIMIT
+from .kitsuasync import KitsuAsync
+from .models import GeneralResult
+
+def timestamp(value: Union[datetime, str, None]) -> Optional[str]:
+    if value is None or isinstance(value, str): return value
+    if value.tzinfo is not None: value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+class Change:
+    __slots__ = ("media", "kind", "result", "updated_at")
+
+    def __init__(self, media: Media, kind: str, result: GeneralResult, updated_at: str):
+        self.media = media
+        self.kind = kind
+        self.result = result
+        self.updated_at = updated_at
+
+    def __repr__(self):
+        return f"Change({self.kind} {self.media.value} {self.result.id} at {self.updated_at})"
+
+class Synchronizer:
+    def __init__(
+        self,
+        client: KitsuAsync,
+        path: str,
+        since: Union[datetime, str, None] = None,
+        limit: Optional[int] = MAX_PAGE_LIMIT
+    ):
+        self.client = client
+        self.path = path
+        self.since = timestamp(since)
+        self.limit = limit
+        self.watermarks = self.__load__()
+        self.pending: Dict[str, Dict[str, Any]] = {}
+
+    def __load__(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path): return {}
+        with open(self.path, "rb") as file:
+            return codec.loads(file.read())
+
+    def __save__(self) -> None:
+        with open(f"{self.path}.tmp", "wb") as file:
+            file.write(codec.encode(self.watermarks))
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def reset(self) -> None:
+        self.watermarks = {}
+        self.pending = {}
+        if os.path.exists(self.path): os.remove(self.path)
+
+    def commit(self, media: Media) -> None:
+        watermark = self.pending.pop(media.value, None)
+        if watermark is None: return
+        self.watermarks[media.value] = watermark
+        self.__save__()
+
+    async def __page__(self, media: Media, page: int) -> Dict[str, Any]:
+        url = self.client.__list_url__(media, "-updatedAt", page, {}, self.limit, None, ["createdAt", "updatedAt"])
+        return await self.client.__request__(url, Endpoint.LATEST)
+
+    async def changes(self, media: Media, commit: Optional[bool] = True) -> AsyncIterator[Change]:
+        watermark = self.watermarks.get(media.value, None) or {"updated_at": self.since, "ids": []}
+        since, seen = watermark["updated_at"], set(watermark["ids"])
+        high, high_ids, emitted = since, set(seen), set()
+
+        page = 1
+        task = asyncio.ensure_future(self.__page__(media, page))
+        try:
+            while task is not None:
+                resources = (await task)["data"]
+                page += 1
+                task = None
+                older = any(since is not None and (resource["attributes"].get("updatedAt", None) or "") < since for resource in resources)
+                if len(resources) == self.limit and not older:
+                    task = asyncio.ensure_future(self.__page__(media, page))
+
+                for resource in resources:
+                    attributes = resource["attributes"]
+                    updated_at = attributes.get("updatedAt", None) or ""
+                    if since is not None and updated_at < since: break
+                    if (updated_at == since and resource["id"] in seen) or resource["id"] in emitted: continue
+                    emitted.add(resource["id"])
+
+                    if high is None or updated_at > high: high, high_ids = updated_at, {resource["id"]}
+                    elif updated_at == high: high_ids.add(resource["id"])
+                    created_at = attributes.get("createdAt", None) or ""
+                    kind = "created" if since is None or created_at > since else "updated"
+                    yield Change(media, kind, GeneralResult(resource), updated_at)
+        finally:
+            if task is not None: task.cancel()
+
+        self.pending[media.value] = {"updated_at": high, "ids": sorted(high_ids)}
+        if commit: self.commit(media)
+
+    async def __refresh__(self, media: Media, changes: List[Change]) -> int:
+        store = self.client.store
+        ids = [change.result.id for change in changes if store.is_stale(media.value, change.result.id, change.updated_at)]
+        store.delete(media.value, ids)
+        fetch = self.client.anime_many if media == Media.ANIME else self.client.manga_many
+        for i in range(0, len(ids), MAX_PAGE_LIMIT * 50):
+            await fetch(ids[i:i + MAX_PAGE_LIMIT * 50])
+        return len(ids)
+
+    async def __sync__(self, media: Media) -> int:
+        changes = [change async for change in self.changes(media, commit=False)]
+        refreshed = await self.__refresh__(media, changes)
+        self.commit(media)
+        return refreshed
+
+    async def sync(self, *medias: Media) -> Dict[Media, int]:
+        if self.client.store is None:
+            raise ValueError("sync requires a client with a SQLiteStore")
+
+        medias = medias or (Media.ANIME, Media.MANGA)
+        return {media: await self.__sync__(media) for media in medias}
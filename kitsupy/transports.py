@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from importlib import import_module
+from threading import Lock, local
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
+from weakref import WeakSet
+
+if TYPE_CHECKING:
+    import aiohttp
+    import httpx
+    import requests
+
+def require(module: str, transport: str, hint: Optional[str] = None) -> Any:
+    try:
+        return import_module(module)
+    except ImportError:
+        raise ImportError(f"{transport} requires the '{module}' package{f' ({hint})' if hint else ''}") from None
+
+class Response:
+    __slots__ = ("status", "reason", "headers", "body", "ttfb")
+
+    def __init__(self, status: int, reason: str, headers: Mapping[str, str], body: bytes, ttfb: float):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.ttfb = ttfb
+
+class Transport(ABC):
+    errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    def get(self, url: str, headers: Dict[str, str]) -> Response:
+        ...
+
+    def close(self) -> None:
+        pass
+
+class AsyncTransport(ABC):
+    errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    async def get(self, url: str, headers: Dict[str, str]) -> Response:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+class RequestsTransport(Transport):
+    def __init__(self, pool_maxsize: Optional[int] = 10, timeout: Optional[float] = None):
+        self.requests = require("requests", "RequestsTransport")
+        self.errors = (self.requests.ConnectionError, self.requests.Timeout)
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._local = local()
+        self._lock = Lock()
+        self._sessions: "WeakSet[requests.Session]" = WeakSet()
+
+    @property
+    def session(self) -> "requests.Session":
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.requests.Session()
+            adapter = self.requests.adapters.HTTPAdapter(pool_maxsize=self.pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            with self._lock: self._sessions.add(session)
+        return session
+
+    def get(self, url: str, headers: Dict[str, str]) -> Response:
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        return Response(response.status_code, response.reason, response.headers, response.content, response.elapsed.total_seconds())
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions: session.close()
+
+class HttpxTransport(Transport):
+    def __init__(self, http2: Optional[bool] = False, max_connections: Optional[int] = 10, timeout: Optional[float] = 30.0):
+        httpx = require("httpx", "HttpxTransport", "httpx[http2] for HTTP/2")
+        self.errors = (httpx.TransportError,)
+        self.client = httpx.Client(http2=http2, limits=httpx.Limits(max_connections=max_connections), timeout=timeout)
+
+    def get(self, url: str, headers: Dict[str, str]) -> Response:
+        start = perf_counter()
+        with self.client.stream("GET", url, headers=headers) as response:
+            ttfb = perf_counter() - start
+            body = response.read()
+        return Response(response.status_code, response.reason_phrase, response.headers, body, ttfb)
+
+    def close(self) -> None:
+        self.client.close()
+
+class AiohttpTransport(AsyncTransport):
+    def __init__(
+        self,
+        limit: Optional[int] = 100,
+        limit_per_host: Optional[int] = 0,
+        keepalive_timeout: Optional[float] = 30.0
+    ):
+        import asyncio
+        self.aiohttp = require("aiohttp", "AiohttpTransport")
+        self.errors = (self.aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        self.connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout
+        }
+        self.session: Optional["aiohttp.ClientSession"] = None
+
+    async def get(self, url: str, headers: Dict[str, str]) -> Response:
+        if self.session is None:
+            self.session = self.aiohttp.ClientSession(connector=self.aiohttp.TCPConnector(**self.connector_options))
+
+        start = perf_counter()
+        async with self.session.get(url, headers=headers) as response:
+            ttfb = perf_counter() - start
+            body = await response.read()
+        return Response(response.status, response.reason, response.headers, body, ttfb)
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+class AsyncHttpxTransport(AsyncTransport):
+    def __init__(
+        self,
+        http2: Optional[bool] = True,
+        max_connections: Optional[int] = 100,
+        timeout: Optional[float] = 30.0
+    ):
+        self.httpx = require("httpx", "AsyncHttpxTransport", "httpx[http2] for HTTP/2")
+        self.errors = (self.httpx.TransportError,)
+        self.options: Dict[str, Any] = {
+            "http2": http2,
+            "limits": self.httpx.Limits(max_connections=max_connections),
+            "timeout": timeout
+        }
+        self.client: Optional["httpx.AsyncClient"] = None
+
+    async def get(self, url: str, headers: Dict[str, str]) -> Response:
+        if self.client is None: self.client = self.httpx.AsyncClient(**self.options)
+
+        start = perf_counter()
+        async with self.client.stream("GET", url, headers=headers) as response:
+            ttfb = perf_counter() - start
+            body = await response.aread()
+        return Response(response.status_code, response.reason_phrase, response.headers, body, ttfb)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None